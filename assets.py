@@ -0,0 +1,240 @@
+import weakref
+from collections import OrderedDict
+
+import pygame
+
+from utils import find_data_file
+
+
+class AssetCache:
+    """
+    Loads every image from disk once, and hands out the same surface from then on.
+    If the display has been set up, images are converted to its pixel format when loaded, so blitting them is fast.
+    Least recently used images are evicted once the cache holds more than its budget of pixel data.
+
+    Fonts are shared the same way, and rendered text is kept around too, up to a limited number of strings.
+
+    Images packed onto an atlas (see atlas.py) are handed out as subsurfaces of it instead of being loaded one by one.
+
+    Cached surfaces are shared, so copy one before drawing onto it.
+    """
+
+    def __init__(self, budget, text_limit=256):
+        self.budget = budget  # Maximum bytes of pixel data to keep around
+        # Map of paths to surfaces, least recently used first
+        self.images = OrderedDict()
+        self.bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+        # Map of (path, size) to fonts
+        self.fonts = {}
+        self.text_limit = text_limit  # Maximum rendered strings to keep around
+        # Map of (path, size, text, color, antialias) to rendered text, least recently used first
+        self.texts = OrderedDict()
+        # Map of (path, size, color, antialias, charset) to glyph atlases
+        self.atlases = {}
+
+        # Surface with lots of images packed onto it, and a map of their paths to where they are on it
+        self.atlas = None
+        self.atlas_rects = {}
+
+    def image(self, path):
+        surface = self.images.get(path)
+        if surface is not None:
+            self.hits += 1
+            self.images.move_to_end(path)
+            return surface
+
+        self.misses += 1
+        rect = self.atlas_rects.get(path)
+        if rect is not None:
+            surface = self.atlas.subsurface(rect)
+        else:
+            surface = _convert(pygame.image.load(find_data_file(path)))
+
+        self._store(path, surface)
+        return surface
+
+    # Serves the images on an atlas from it from now on (e.g. use_atlas(*atlas.load_atlas()))
+    def use_atlas(self, surface, rects):
+        self.atlas = _convert(surface)
+        self.atlas_rects = rects
+        for path in rects:
+            surface = self.images.pop(path, None)
+            if surface is not None:
+                self.bytes -= _surface_bytes(surface)
+
+    # Caches a surface built out of other assets (e.g. several images drawn onto one), counting towards the same budget.
+    # The key can be anything hashable which isn't an image path, and build is only called if it isn't cached
+    def composite(self, key, build):
+        surface = self.images.get(key)
+        if surface is not None:
+            self.hits += 1
+            self.images.move_to_end(key)
+            return surface
+
+        self.misses += 1
+        surface = build()
+        self._store(key, surface)
+        return surface
+
+    def font(self, path, size):
+        key = (path, size)
+        font = self.fonts.get(key)
+        if font is None:
+            font = self.fonts[key] = pygame.font.Font(find_data_file(path), size)
+        return font
+
+    # Same as Font.render, but only renders each distinct string once
+    def text(self, path, size, text, color, antialias=True):
+        key = (path, size, text, tuple(pygame.Color(color)), antialias)
+        surface = self.texts.get(key)
+        if surface is not None:
+            self.texts.move_to_end(key)
+            return surface
+
+        surface = self.font(path, size).render(text, antialias, color)
+        self.texts[key] = surface
+        if len(self.texts) > self.text_limit:
+            self.texts.popitem(last=False)
+        return surface
+
+    # For text which changes all the time but only ever uses a few characters, like a score.
+    # Rather than caching every string, every character is rendered once and strings are pieced together from them
+    def glyphs(self, path, size, color, antialias=True, charset="0123456789"):
+        key = (path, size, tuple(pygame.Color(color)), antialias, charset)
+        atlas = self.atlases.get(key)
+        if atlas is None:
+            atlas = self.atlases[key] = GlyphAtlas(
+                self.font(path, size), color, antialias, charset
+            )
+        return atlas
+
+    # Snapshot of the cache's counters, handy for debugging and profiling
+    def stats(self):
+        return {
+            "images": len(self.images),
+            "bytes": self.bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "texts": len(self.texts),
+            "atlas_bytes": 0 if self.atlas is None else _surface_bytes(self.atlas),
+        }
+
+    def clear(self):
+        self.images.clear()
+        self.bytes = 0
+        self.texts.clear()
+        self.atlases.clear()
+
+    def _store(self, key, surface):
+        self.images[key] = surface
+        self.bytes += _surface_bytes(surface)
+        self._evict()
+
+    # Drops least recently used images until we're back under budget, always keeping the newest one
+    def _evict(self):
+        while self.bytes > self.budget and len(self.images) > 1:
+            _, surface = self.images.popitem(last=False)
+            self.bytes -= _surface_bytes(surface)
+            self.evictions += 1
+
+
+class GlyphAtlas:
+    """
+    Every character in a charset rendered once, side by side on a single surface.
+    Any string made up of those characters can then be drawn without rendering text at all.
+    """
+
+    def __init__(self, font, color, antialias, charset):
+        glyphs = [font.render(char, antialias, color) for char in charset]
+        self.height = font.get_height()
+        self.surface = pygame.Surface(
+            (sum(glyph.get_width() for glyph in glyphs), self.height), pygame.SRCALPHA
+        )
+        # Map of characters to where they are on the atlas
+        self.areas = {}
+
+        x = 0
+        for char, glyph in zip(charset, glyphs):
+            # Copy the glyph's pixels as they are, rather than blending them onto the transparent atlas
+            flags = pygame.BLEND_RGBA_MAX if glyph.get_flags() & pygame.SRCALPHA else 0
+            self.surface.blit(glyph, (x, 0), special_flags=flags)
+            self.areas[char] = pygame.Rect(x, 0, glyph.get_width(), self.height)
+            x += glyph.get_width()
+
+    # The blits which draw text with its top left corner at dest, for passing to blits()
+    def blit_sequence(self, text, dest):
+        x, y = dest
+        blits = []
+        for char in text:
+            area = self.areas[char]
+            blits.append((self.surface, (x, y), area))
+            x += area.width
+        return blits
+
+
+class RotationCache:
+    """
+    Keeps rotated copies of surfaces, so a sprite which keeps coming back to the same angles is only rotated once per angle.
+    Angles are rounded to the nearest step, and each surface only keeps its most recently used rotations.
+    Rotations are dropped along with their surface once nothing else uses it.
+    """
+
+    def __init__(self, step=0.5, per_surface=256):
+        self.step = step  # Degrees to round angles to
+        self.per_surface = per_surface  # Maximum rotations to keep for any one surface
+        # Map of surfaces to their rotations (keyed by rounded angle), least recently used first
+        self.rotations = weakref.WeakKeyDictionary()
+        self.hits = 0
+        self.misses = 0
+
+    # Same as pygame.transform.rotate, but cached. An angle of 0 hands back the surface itself
+    def rotate(self, surface, angle):
+        angle = round(angle / self.step) * self.step % 360
+        if angle == 0:
+            return surface
+
+        rotations = self.rotations.get(surface)
+        if rotations is None:
+            rotations = self.rotations[surface] = OrderedDict()
+
+        rotated = rotations.get(angle)
+        if rotated is not None:
+            self.hits += 1
+            rotations.move_to_end(angle)
+            return rotated
+
+        self.misses += 1
+        rotated = pygame.transform.rotate(surface, angle)
+        rotations[angle] = rotated
+        if len(rotations) > self.per_surface:
+            rotations.popitem(last=False)
+        return rotated
+
+    def clear(self):
+        self.rotations.clear()
+
+
+# Converts a surface to the display's pixel format, so blitting it is fast. Does nothing before the display is set up
+def _convert(surface):
+    if pygame.display.get_surface() is None:
+        return surface
+    if surface.get_flags() & pygame.SRCALPHA:
+        return surface.convert_alpha()
+    return surface.convert()
+
+
+# Subsurfaces share their parent's pixels, so they don't take up any more memory
+def _surface_bytes(surface):
+    if surface.get_parent() is not None:
+        return 0
+    return surface.get_pitch() * surface.get_height()
+
+
+# Create singleton caches shared by the whole game
+ASSETS = AssetCache(64 * 1024 * 1024)
+ROTATIONS = RotationCache()
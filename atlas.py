@@ -0,0 +1,122 @@
+import json
+import os
+
+import pygame
+from appdirs import user_cache_dir
+
+from utils import APP_AUTHOR, APP_NAME, find_data_file
+
+# Small images used all over the game, which get packed together onto a single atlas
+ATLAS_IMAGES = [
+    "resources/btn_inactive.png",
+    "resources/btn_hover.png",
+    "resources/btn_press.png",
+    "resources/btn_locked.png",
+    "resources/shop_btn_inactive.png",
+    "resources/shop_btn_hover.png",
+    "resources/shop_btn_press.png",
+    "resources/shop_btn_locked.png",
+    "resources/checkmark.png",
+    "resources/locked.png",
+    "resources/icarus_body.png",
+    "resources/object_bird.png",
+    "resources/object_cloud.png",
+    "resources/object_plane.png",
+    "resources/object_moon.png",
+]
+ATLAS_WIDTH = 1024
+# Bump this whenever the way atlases are packed changes, so atlases built by older versions get rebuilt
+ATLAS_VERSION = 1
+
+ATLAS_FILE = "atlas.png"
+INDEX_FILE = "atlas.json"
+
+
+# Packs rects of the given sizes into rows (shelves) no wider than width, tallest first.
+# Returns where each one went, in the same order as sizes, and the total height used
+def pack(sizes, width):
+    rects = [None] * len(sizes)
+    x = y = shelf_height = 0
+    for i in sorted(range(len(sizes)), key=lambda i: (-sizes[i][1], -sizes[i][0])):
+        w, h = sizes[i]
+        if w > width:
+            raise ValueError(f"{w}px wide image doesn't fit on a {width}px wide atlas")
+        # Start a new shelf once this one is full
+        if x + w > width:
+            x = 0
+            y += shelf_height
+            shelf_height = 0
+        rects[i] = pygame.Rect(x, y, w, h)
+        x += w
+        shelf_height = max(shelf_height, h)
+    return rects, y + shelf_height
+
+
+# Packs images onto one surface, and returns it along with a map of paths to where each image is on it
+def build_atlas(paths=ATLAS_IMAGES, width=ATLAS_WIDTH):
+    images = [pygame.image.load(find_data_file(path)) for path in paths]
+    rects, height = pack([image.get_size() for image in images], width)
+
+    surface = pygame.Surface((width, height), pygame.SRCALPHA)
+    for image, rect in zip(images, rects):
+        # Copy the image's pixels as they are, rather than blending them onto the transparent atlas
+        surface.blit(image, rect, special_flags=pygame.BLEND_RGBA_MAX)
+    return surface, dict(zip(paths, rects))
+
+
+# Writes an atlas and its index to the given directory
+def save_atlas(surface, rects, directory, paths=ATLAS_IMAGES):
+    if not os.path.exists(directory):
+        os.makedirs(directory)
+    pygame.image.save(surface, os.path.join(directory, ATLAS_FILE))
+
+    index = {
+        "version": ATLAS_VERSION,
+        "sources": _sources(paths),
+        "rects": {path: list(rect) for path, rect in rects.items()},
+    }
+    with open(os.path.join(directory, INDEX_FILE), "w") as f:
+        json.dump(index, f, indent=2)
+
+
+# Returns the atlas and its index, building it first if there isn't an up to date one in the directory.
+# If the atlas can't be written (e.g. a read only disk), the freshly built one is still returned
+def load_atlas(directory=None, paths=ATLAS_IMAGES):
+    if directory is None:
+        directory = user_cache_dir(APP_NAME, APP_AUTHOR)
+
+    try:
+        with open(os.path.join(directory, INDEX_FILE), "r") as f:
+            index = json.load(f)
+        if index["version"] == ATLAS_VERSION and index["sources"] == _sources(paths):
+            surface = pygame.image.load(os.path.join(directory, ATLAS_FILE))
+            rects = {path: pygame.Rect(rect) for path, rect in index["rects"].items()}
+            return surface, rects
+    except (OSError, ValueError, KeyError, pygame.error):
+        pass
+
+    surface, rects = build_atlas(paths)
+    try:
+        save_atlas(surface, rects, directory, paths)
+    except (OSError, pygame.error):
+        pass
+    return surface, rects
+
+
+# Helper function to get what each source image looked like on disk, so we can tell when an atlas is out of date
+def _sources(paths):
+    sources = {}
+    for path in paths:
+        stat = os.stat(find_data_file(path))
+        sources[path] = [stat.st_size, stat.st_mtime_ns]
+    return sources
+
+
+# Running this file rebuilds the atlas ahead of time, e.g. as part of a build
+if __name__ == "__main__":
+    directory = user_cache_dir(APP_NAME, APP_AUTHOR)
+    surface, rects = build_atlas()
+    save_atlas(surface, rects, directory)
+    print(
+        f"Packed {len(rects)} images onto a {surface.get_width()}x{surface.get_height()} atlas in {directory}"
+    )
@@ -0,0 +1,63 @@
+import math
+
+import pygame
+
+from assets import ASSETS
+from ecs import Component
+
+
+class BackgroundComponent(Component):
+    """
+    A background made of square tiles stacked on top of each other, which repeats forever sideways.
+    The stack is drawn onto one tall strip up front, so drawing the background never has to touch more
+    than the handful of tiles which are actually on screen.
+    """
+
+    def __init__(self, tile_paths, top):
+        tiles = [ASSETS.image(path) for path in tile_paths]
+        tile_width, tile_height = tiles[0].get_size()
+        strip = ASSETS.composite(("background", *tile_paths), lambda: _stack(tiles))
+
+        metadata = {
+            "strip": strip,
+            "tile_width": tile_width,
+            "tile_height": tile_height,
+            "rows": len(tiles),
+            # World y coordinate of the top of the first tile
+            "top": top,
+        }
+        Component.__init__(self, "background", metadata)
+
+
+# Helper function which draws tiles onto one surface, from the top down
+def _stack(tiles):
+    tile_width, tile_height = tiles[0].get_size()
+    strip = pygame.Surface((tile_width, tile_height * len(tiles)))
+    for row, tile in enumerate(tiles):
+        strip.blit(tile, (0, row * tile_height))
+    return strip
+
+
+# Helper function to draw the background onto a surface, as seen by a camera at the given position.
+# Only tiles which overlap the surface get drawn, all with a single blits() call
+def render_background(surface, world, camera_x, camera_y):
+    background = world.find_component("background")
+    strip = background.strip
+    tile_width = background.tile_width
+    tile_height = background.tile_height
+    width, height = surface.get_size()
+
+    # The background repeats sideways, so start at whichever tile the left edge of the screen is in.
+    # Positions are truncated the same way blit() does, since blits() is much slower with float positions
+    first_x = int(-(camera_x % tile_width))
+    top = background.top - camera_y
+    first_row = max(0, math.floor(-top / tile_height))
+    last_row = min(background.rows, math.ceil((height - top) / tile_height))
+
+    blits = []
+    for row in range(first_row, last_row):
+        area = pygame.Rect(0, row * tile_height, tile_width, tile_height)
+        y = int(top + row * tile_height)
+        for x in range(first_x, width, tile_width):
+            blits.append((strip, (x, y), area))
+    surface.blits(blits, doreturn=False)
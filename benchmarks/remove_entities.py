@@ -0,0 +1,50 @@
+import os
+import sys
+import time
+
+# Allow running this straight from the repository root: python benchmarks/remove_entities.py
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from ecs import WORLD, Component  # noqa: E402
+
+SIZES = [10_000, 20_000, 50_000, 100_000]
+
+
+# Fill the world with entities shaped like the game's collectables
+def spawn(count):
+    entities = []
+    for _ in range(count):
+        entity = WORLD.gen_entity()
+        entity.attach(Component("collectable", {"worth": 100}))
+        entity.attach(Component("position", {"x": 0, "y": 0}))
+        entity.attach(Component("rotation", {"angle": 0}))
+        entity.attach(Component("graphic", {"sprite": None}))
+        entities.append(entity)
+    return entities
+
+
+# Time removing every other entity one at a time, then the rest in one batch,
+# which mirrors both the CollectableSystem cleanup and a scene teardown
+def bench(count):
+    entities = spawn(count)
+
+    start = time.perf_counter()
+    for entity in entities[::2]:
+        WORLD.remove_entity(entity)
+    WORLD.remove_entities(WORLD.filter("collectable"))
+    elapsed = time.perf_counter() - start
+
+    assert WORLD.filter("collectable") == []
+    assert list(WORLD.query("collectable", "position")) == []
+    return elapsed
+
+
+def main():
+    print(f"{'entities':>10} {'total (ms)':>12} {'per entity (us)':>16}")
+    for count in SIZES:
+        elapsed = bench(count)
+        print(f"{count:>10} {elapsed * 1000:>12.1f} {elapsed / count * 1e6:>16.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,19 +1,30 @@
 import pygame
 
+from assets import ASSETS
 from ecs import Component, System
-from utils import find_data_file
+from game_events import SoundEvent
 
+BUTTON_FONT = "resources/dpcomic-font/DpcomicRegular-p3jD.ttf"
 
-# Helper function which creates the surfaces for buttons
+
+# Helper function which creates the surfaces for buttons.
+# Buttons which look the same share surfaces, so each look is only ever drawn once (until the asset cache evicts it)
 def _create_image(image_path, text, is_disabled, btn_image):
-    font = pygame.font.Font(
-        find_data_file("resources/dpcomic-font/DpcomicRegular-p3jD.ttf"), 27
+    key = ("button", image_path, text, is_disabled, btn_image)
+    return ASSETS.composite(
+        key, lambda: _draw_image(image_path, text, is_disabled, btn_image)
     )
+
+
+# Helper function which draws the surface for a button
+def _draw_image(image_path, text, is_disabled, btn_image):
+    font = ASSETS.font(BUTTON_FONT, 27)
     # create a sprite from the given image path
     # and create the rect to blit the text onto
     # if this is for the pressed button, move the rect down to keep the text aligned
     sprite = pygame.sprite.Sprite()
-    sprite.image = pygame.image.load(find_data_file(image_path))
+    # copy the cached image, since we draw onto it
+    sprite.image = ASSETS.image(image_path).copy()
     sprite.rect = sprite.image.get_rect()
     if "press" in image_path:
         sprite.rect.move_ip(0, 4)
@@ -29,27 +40,42 @@ def _create_image(image_path, text, is_disabled, btn_image):
         sprite.image.blit(text_surf, text_rect)
 
     if btn_image is not None:
-        image = pygame.image.load(find_data_file(btn_image))
+        image = ASSETS.image(btn_image)
         rect = image.get_rect()
         rect.move_ip(-1, -4)
         sprite.image.blit(image, rect)
     return sprite.image
 
 
-# Helper function to take all buttons from the world and render then to a surface
+# Helper function to take all buttons from the world and render then to a surface.
+# Returns the rects of any buttons which look different to the last time they were rendered
 def render_all_buttons(surface, world):
+    changed = []
+    blits = []
     buttons = world.filter("button")
     for button in buttons:
         btn = button["button"]
         if btn["isDisabled"]:
-            surface.blit(btn["disabled"], btn["rect"])
+            state = "disabled"
         else:
             if btn["isMouseDown"]:
-                surface.blit(btn["clicked"], btn["rect"])
+                state = "clicked"
             elif btn["active"]:
-                surface.blit(btn["hover"], btn["rect"])
+                state = "hover"
             else:
-                surface.blit(btn["normal"], btn["rect"])
+                state = "normal"
+        blits.append((btn[state], btn["rect"]))
+
+        drawn = btn["drawn"]
+        if drawn is None or drawn[0] != state or drawn[1] != btn["rect"]:
+            changed.append(btn["rect"].copy())
+            # If the button moved, where it used to be changed too
+            if drawn is not None and drawn[1] != btn["rect"]:
+                changed.append(drawn[1])
+            btn["drawn"] = (state, btn["rect"].copy())
+
+    surface.blits(blits, doreturn=False)
+    return changed
 
 
 class ButtonComponent(Component):
@@ -99,10 +125,13 @@ class ButtonComponent(Component):
             "isMouseDown": False,
             "isDisabled": is_disabled,
             "callback": callback,
+            # Which image was last drawn, and where
+            "drawn": None,
         }
         Component.__init__(self, "button", metadata)
 
 
+# Doesn't declare what it reads and writes (see System), since button callbacks can do anything, so it runs on its own
 class ButtonSystem(System):
     def __init__(self):
         super().__init__()
@@ -131,13 +160,7 @@ class ButtonSystem(System):
 
             # Play a sound if the button has been focused
             if not previously_active and currently_active and not is_disabled:
-                world.inject_event(
-                    {
-                        "type": "sound",
-                        "action": "play",
-                        "sound": "rollover",
-                    }
-                )
+                world.inject_event(SoundEvent.shared("play", "rollover"))
 
             # If the mouse is clicked, highlight the button as clicked until mouseup
             if currently_active and mousedown and not is_disabled:
@@ -149,12 +172,6 @@ class ButtonSystem(System):
             # Test if the button is clicked, play a clicked sound,
             # Then run the callback if it exists
             if currently_active and btn["isMouseDown"] and mouseup and not is_disabled:
-                world.inject_event(
-                    {
-                        "type": "sound",
-                        "action": "play",
-                        "sound": "click",
-                    }
-                )
+                world.inject_event(SoundEvent.shared("play", "click"))
                 if btn["callback"] and not is_disabled:
                     btn["callback"]()
@@ -9,6 +9,10 @@ class ContextComponent(Component):
             "background": background,
             "running": True,
             "paused": False,
+            # Number of fixed simulation steps run this frame
+            "steps": 1,
+            # How far the current frame is between the last simulation step and the next, from 0 to 1
+            "interpolation": 1.0,
         }
         Component.__init__(self, "context", metadata)
 
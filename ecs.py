@@ -1,43 +1,153 @@
 import json
-import uuid
-from typing import Dict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, FrozenSet, Tuple
+
+import numpy as np
 
 from utils import find_data_file
 
+# Entity IDs are plain integers packing a slot number in the low bits and that slot's generation in the high bits.
+# Slots are recycled once their entity is removed, and bumping the generation gives the recycled slot a brand new ID,
+# so any stale ID still stored somewhere (e.g. in a component) simply stops resolving through World.get()
+ENTITY_SLOT_BITS = 32
+ENTITY_SLOT_MASK = (1 << ENTITY_SLOT_BITS) - 1
+
 
 class World:
     eindex = {}  # Index mapping entity IDs to entity objects
-    cindex = {}  # Index mapping component names to entity objects
+    cindex = {}  # Index mapping component names to sets of entity objects
     systems = []  # List of all systems
-    subscriptions = {}  # Map of which systems are subscribed to which events
+    # Systems grouped into stages which run one after another (see schedule()), worked out again whenever systems change
+    stages = None
+    executor = None  # Thread pool the systems in a stage run on together, if set_workers() was called
+    # Map of event types to a tuple of the systems subscribed to them, rebuilt whenever a system subscribes or leaves,
+    # so dispatching an event never has to build anything
+    subscriptions = {}
     # List to buffer all events in before they are dispatched to systems
     events_to_send = []
+    # Map of component sets to the archetype table holding those entities
+    archetypes = {}
+    aindex = {}  # Index mapping component names to the archetypes containing them
+    queries = {}  # Cache of the archetypes matching each query made through query()
+    # Current generation of every entity slot, bumped when its entity is removed
+    generations = []
+    free_slots = []  # Entity slots whose entity has been removed, ready to be recycled
+    # Map of columnar component names to the fields stored in their columns
+    schemas = {}
+    # Extra indexes (like a SpatialHash) that need to forget removed entities
+    indexes = []
 
     # This function generates a new entity within this world. The entity is tracked inside this worlds mappings
     def gen_entity(self):
-        id = str(uuid.uuid4())
+        if self.free_slots:
+            slot = self.free_slots.pop()
+        else:
+            slot = len(self.generations)
+            self.generations.append(0)
+        id = (self.generations[slot] << ENTITY_SLOT_BITS) | slot
         entity = Entity(id)
         self.eindex[id] = entity
+        self._move_to_archetype(entity, frozenset())
         return entity
 
     # This function removes an entity from the ECS world, wiping it from all internal indexes
     def remove_entity(self, entity):
-        entity = self.eindex.pop(entity.id)
-        for component in entity.components:
-            self.cindex[component].remove(entity)
+        self._remove(entity.id)
 
     # This function removes a list of entities from the ECS world, wiping it from all internal indexes
     def remove_entities(self, entities):
         ids = [entity.id for entity in entities]
         for id in ids:
-            entity = self.eindex.pop(id)
-            for component in entity.components:
-                self.cindex[component].remove(entity)
+            self._remove(id)
+
+    # Internal helper which wipes an entity from all internal indexes, then retires its ID so the slot can be
+    # recycled under the next generation
+    def _remove(self, id):
+        entity = self.eindex.pop(id)
+        for component in entity.components:
+            self.cindex[component].remove(entity)
+        # Columnar components copy their values back out of the table, so they stay readable after removal
+        for component in entity.columnar:
+            component.unbind()
+        entity.archetype.remove(entity)
+        for index in self.indexes:
+            index.remove(entity)
+
+        slot = id & ENTITY_SLOT_MASK
+        self.generations[slot] += 1
+        self.free_slots.append(slot)
 
     # Query method which returns a list of all entities which have a given component. Useful for building systems
     def filter(self, component):
         entities = self.cindex.get(component)
-        return entities if entities is not None else []
+        return entities.entities if entities is not None else []
+
+    # Query method which yields every entity that has ALL of the given components. Rather than intersecting the per-component
+    # lists, it walks the archetype tables that contain the requested components, so no sets are built per call:
+    #     WORLD.query('physics', 'position', 'rotation')
+    # Attaching components to an entity moves it to another table, so avoid doing that while iterating a query
+    def query(self, *components):
+        for archetype in self.tables(*components):
+            yield from archetype.entities
+
+    # Query method which returns the archetype tables whose entities have ALL of the given components.
+    # The result is cached per component set, and kept up to date as new archetypes are created
+    def tables(self, *components):
+        key = frozenset(components)
+        tables = self.queries.get(key)
+        if tables is None:
+            # Only the tables holding the rarest requested component can possibly match
+            candidates = min(
+                (self.aindex.get(component, []) for component in key),
+                key=len,
+                default=self.archetypes.values(),
+            )
+            tables = [
+                archetype for archetype in candidates if key <= archetype.components
+            ]
+            self.queries[key] = tables
+        return tables
+
+    # Copies the current values of a columnar component into the "previous" columns of every table storing it.
+    # Calling this at the start of each fixed simulation step lets the renderer blend between the last two steps
+    # with Archetype.interpolate(), so motion stays smooth when frames are rendered in between simulation steps
+    def save_previous(self, component):
+        for archetype in self.tables(component):
+            archetype.save_previous(component)
+
+    # Internal helper which returns the archetype table for an exact set of components, creating it if it doesn't exist
+    def _archetype(self, components):
+        archetype = self.archetypes.get(components)
+        if archetype is None:
+            schemas = {
+                component: self.schemas[component]
+                for component in components
+                if component in self.schemas
+            }
+            archetype = Archetype(components, schemas)
+            self.archetypes[components] = archetype
+            for component in components:
+                self.aindex.setdefault(component, []).append(archetype)
+            # Let all the cached queries this new table satisfies know about it
+            for key, tables in list(self.queries.items()):
+                if key <= components:
+                    tables.append(archetype)
+        return archetype
+
+    # Internal helper which moves an entity from its current archetype table into the one matching the given components
+    # Any columnar values the two tables have in common are carried over to the entity's new row
+    def _move_to_archetype(self, entity, components):
+        old = entity.archetype
+        if old is not None and old.components == components:
+            return
+        new = self._archetype(components)
+        if old is None:
+            new.add(entity)
+            return
+        old_row = entity.row
+        new.add(entity)
+        new.copy_row(old, old_row, entity.row)
+        old.remove_row(old_row)
 
     # Query method for when you only have one entity with a given component. It returns the component from that single entity
     # Useful for things like global game settings so you can say:
@@ -59,38 +169,135 @@ class World:
 
     # Query method that returns an entity given a particular id. This is useful for cross referencing entities. For example,
     # entity A could store entity B's ID in a component. This would then allow you to look up entity B while analyzing entity A.
-    # Useful for parent-child relationships too
+    # Useful for parent-child relationships too. IDs of removed entities are never handed out again, so a stale ID returns None
     def get(self, eid):
         return self.eindex.get(eid)
 
     # Registers a system with the world. This allows events to be dispatched to it, as well as run through the helper method
     def register_system(self, system):
         self.systems.append(system)
+        self.stages = None
 
-    # Unregisters a system with the world so it will stop being run
+    # Unregisters a system with the world so it will stop being run, and stop being sent events
     def unregister_system(self, system):
         if system in self.systems:
             self.systems.remove(system)
+            self.stages = None
+        for (event_type, subscribers) in self.subscriptions.items():
+            if system in subscribers:
+                self.subscriptions[event_type] = tuple(
+                    subscriber for subscriber in subscribers if subscriber is not system
+                )
+
+    # Wipes every entity, system and event from the world, putting it back the way it was when the game started.
+    # Useful for running many independent simulations one after another in the same process
+    def reset(self):
+        for index in (
+            self.eindex,
+            self.cindex,
+            self.subscriptions,
+            self.archetypes,
+            self.aindex,
+            self.queries,
+            self.schemas,
+        ):
+            index.clear()
+        for buffer in (
+            self.systems,
+            self.events_to_send,
+            self.generations,
+            self.free_slots,
+            self.indexes,
+        ):
+            buffer.clear()
+        self.stages = None
+
+    # Registers an extra index with the world, so that removed entities are automatically taken out of it as well
+    def register_index(self, index):
+        self.indexes.append(index)
+
+    # Unregisters an extra index with the world
+    def unregister_index(self, index):
+        if index in self.indexes:
+            self.indexes.remove(index)
 
     # Calling this method injects an event into the world. In the implementation, all events are buffered until the systems are processed. This makes it so
     # all systems see the same events every frame, instead of System B adding an event before System C runs. In the old arch, System A (which ran before system B)
     # wouldn't see that event until the next frame where as System C would process that event on the current frame.
+    # Events must be Event objects (see below), since systems read their fields as attributes.
     def inject_event(self, event):
+        if not isinstance(event, Event):
+            raise TypeError(f"Expected an Event, got {type(event).__name__}")
         self.events_to_send.append(event)
 
     # Internal helper function to dispatch the buffered events to the proper system. It's called right before the systems are processed.
     def _dispatch_events(self):
+        subscriptions = self.subscriptions
         for event in self.events_to_send:
-            event_type = event["type"]
-            for subscriber in self.subscriptions.get(event_type, []):
+            for subscriber in subscriptions.get(event.type, ()):
                 subscriber.events.append(event)
-        self.events_to_send = []
+        self.events_to_send.clear()
 
-    # Convenience method to run all currently registered systems
+    # Runs systems which can safely run at the same time on a pool of threads. With no workers (the default), every
+    # system runs on the calling thread, one at a time
+    def set_workers(self, workers):
+        if self.executor is not None:
+            self.executor.shutdown()
+        self.executor = ThreadPoolExecutor(workers) if workers else None
+
+    # Convenience method to run all currently registered systems, a stage at a time
     def process_all_systems(self, pygame_events):
         self._dispatch_events()
-        for system in self.systems:
-            system.process(pygame_events, WORLD)
+        if self.stages is None:
+            self.stages = schedule(self.systems)
+
+        for stage in self.stages:
+            if self.executor is None or len(stage) == 1:
+                for system in stage:
+                    system.process(pygame_events, WORLD)
+            else:
+                futures = [
+                    self.executor.submit(system.process, pygame_events, WORLD)
+                    for system in stage
+                ]
+                for future in futures:
+                    future.result()
+
+
+class Event:
+    """
+    Base class for events sent between systems with World.inject_event.
+    Each kind of event is a subclass which sets the type systems subscribe to, and lists its fields in __slots__,
+    so events are small and cheap to make. Fields can also be read like a dict (event["angle"]).
+
+    Events are never changed once they've been made, so the same event can be injected over and over.
+    Events without fields can be made once and reused, and shared() does the same for events with a handful of
+    possible values (like which sound to play).
+    """
+
+    __slots__ = ()
+    type = None
+
+    def __getitem__(self, key):
+        return getattr(self, key)
+
+    # Returns the one event made with these fields, making it the first time it's asked for
+    @classmethod
+    def shared(cls, *fields):
+        key = (cls, fields)
+        event = _shared_events.get(key)
+        if event is None:
+            event = _shared_events[key] = cls(*fields)
+        return event
+
+    # Helper method which allows events to be formatted, which is useful for debugging
+    def __repr__(self):
+        fields = {name: getattr(self, name) for name in self.__slots__}
+        return f"{type(self).__name__}({self.type!r}, {fields})"
+
+
+# Map of (event class, fields) to the events handed out by Event.shared()
+_shared_events = {}
 
 
 class Component:
@@ -136,6 +343,274 @@ class Component:
             return Component(metatype, metadata)
 
 
+# A ColumnarComponent is an opt-in kind of component whose fields are stored as NumPy columns inside the archetype
+# table of the entity it's attached to, instead of in the component's own __dict__. Reading and writing the fields
+# of a single entity works exactly like any other component:
+#
+#     entity.position.x += 5
+#
+# but systems that touch many entities at once can grab the columns from each matching table and process them in bulk:
+#
+#     for table in world.tables('position'):
+#         table.column('position', 'x')[:] += 5
+#
+# All fields are stored as 64-bit floats. Until the component is attached, its values are just held in a plain dict.
+class ColumnarComponent(Component):
+    fields: Tuple[str, ...] = ()
+
+    def __init__(self, metatype: str, metadata: Dict[str, float]):
+        object.__setattr__(self, "metatype", metatype)
+        object.__setattr__(self, "fields", tuple(metadata))
+        object.__setattr__(self, "values", dict(metadata))
+        object.__setattr__(self, "entity", None)
+
+    # Internal helper called when the component is attached, which moves its values into the entity's table
+    def bind(self, entity):
+        columns = entity.archetype.columns[self.metatype]
+        # A brand new component hasn't moved yet, so its previous values are the same as its current ones
+        previous = entity.archetype.previous.get(self.metatype, {})
+        for field, value in self.values.items():
+            columns[field][entity.row] = value
+            if field in previous:
+                previous[field][entity.row] = value
+        object.__setattr__(self, "entity", entity)
+
+    # Internal helper called when the entity is removed from the world, which copies its values back out of the table
+    def unbind(self):
+        object.__setattr__(
+            self, "values", {field: getattr(self, field) for field in self.fields}
+        )
+        object.__setattr__(self, "entity", None)
+
+    # Fields aren't in __dict__, so attribute lookups for them fall through to here
+    def __getattr__(self, name):
+        if name not in self.fields:
+            raise AttributeError(name)
+        entity = self.entity
+        if entity is None:
+            return self.values[name]
+        return entity.archetype.columns[self.metatype][name].item(entity.row)
+
+    def __setattr__(self, name, value):
+        if name not in self.fields:
+            object.__setattr__(self, name, value)
+        elif self.entity is None:
+            self.values[name] = value
+        else:
+            self.entity.archetype.columns[self.metatype][name][self.entity.row] = value
+
+    def __getitem__(self, key):
+        return getattr(self, key)
+
+    def __setitem__(self, key, value):
+        setattr(self, key, value)
+
+    def __repr__(self):
+        return str({field: getattr(self, field) for field in self.fields})
+
+
+# An EntitySet is a list of entities that supports constant time removal. Each entity's position in the list is
+# tracked by ID, and removing an entity swaps the last entity into the hole it leaves behind. That keeps the list
+# dense, so iterating it is as cheap as iterating a plain list, in an order that only depends on the adds and removes.
+class EntitySet:
+    def __init__(self):
+        self.entities = []
+        # Index mapping entity IDs to their position in the entities list
+        self.positions = {}
+
+    def add(self, entity):
+        if entity.id not in self.positions:
+            self.positions[entity.id] = len(self.entities)
+            self.entities.append(entity)
+
+    def remove(self, entity):
+        position = self.positions.pop(entity.id, None)
+        if position is None:
+            return
+        last = self.entities.pop()
+        if last is not entity:
+            self.entities[position] = last
+            self.positions[last.id] = position
+
+    def __len__(self):
+        return len(self.entities)
+
+    def __iter__(self):
+        return iter(self.entities)
+
+
+# An Archetype is a table holding every entity that has exactly the same set of components. Entities move
+# between tables as components are attached to them, so a query for several components only has to visit
+# the handful of tables whose component set is a superset of the query, rather than intersecting big lists.
+# Entities are swap-removed from their table, and each entity keeps its row in the table as a back-pointer.
+#
+# Tables also own the NumPy columns of any ColumnarComponents in their component set. Row i of every column belongs
+# to entities[i]; the arrays are over-allocated and grow by doubling, so use column() to get just the live rows.
+# A second set of "previous" columns holding the values from the last World.save_previous() call is kept alongside
+# them for the components that need it.
+class Archetype:
+    def __init__(self, components: FrozenSet[str], schemas: Dict[str, Tuple[str, ...]]):
+        self.components = components
+        self.entities = []
+        self.capacity = 8
+        self.columns = {
+            component: {field: np.zeros(self.capacity) for field in fields}
+            for component, fields in schemas.items()
+        }
+        # Columns holding the values of each component as of the last save_previous()
+        self.previous = {}
+
+    # Returns a view of the live rows of one column, which can be read or written in place
+    def column(self, component, field):
+        return self.columns[component][field][: len(self.entities)]
+
+    # Returns the live rows of a column blended between their previous and current values by alpha, from 0 to 1.
+    # Falls back to the current values if they have never been saved
+    def interpolate(self, component, field, alpha):
+        current = self.column(component, field)
+        previous = self.previous.get(component)
+        if previous is None:
+            return current
+        previous = previous[field][: len(self.entities)]
+        return previous + (current - previous) * alpha
+
+    def save_previous(self, component):
+        if component not in self.previous:
+            self.previous[component] = {
+                field: np.zeros(self.capacity) for field in self.columns[component]
+            }
+        for field, column in self.columns[component].items():
+            self.previous[component][field][:] = column
+
+    def add(self, entity):
+        if len(self.entities) == self.capacity:
+            self._grow()
+        entity.archetype = self
+        entity.row = len(self.entities)
+        self.entities.append(entity)
+
+    def remove(self, entity):
+        self.remove_row(entity.row)
+        entity.archetype = None
+        entity.row = None
+
+    # Removes a row by moving the last row into it, for both the entity list and every column
+    def remove_row(self, row):
+        last = self.entities.pop()
+        end = len(self.entities)
+        if row != end:
+            self.entities[row] = last
+            last.row = row
+            for columns in self._column_groups():
+                for column in columns.values():
+                    column[row] = column[end]
+
+    # Copies the columnar values another table has in common with this one from one of its rows into one of ours
+    def copy_row(self, other, other_row, row):
+        for component, columns in self.columns.items():
+            other_columns = other.columns.get(component)
+            if other_columns is not None:
+                for field, column in columns.items():
+                    column[row] = other_columns[field][other_row]
+        for component, columns in self.previous.items():
+            # If the other table never saved previous values, the current ones are the best we've got
+            other_columns = other.previous.get(component, other.columns.get(component))
+            if other_columns is not None:
+                for field, column in columns.items():
+                    column[row] = other_columns[field][other_row]
+
+    # Internal helper that doubles the size of every column once the table is full
+    def _grow(self):
+        self.capacity *= 2
+        for columns in self._column_groups():
+            for field, column in columns.items():
+                grown = np.zeros(self.capacity)
+                grown[: len(column)] = column
+                columns[field] = grown
+
+    # Internal helper to walk both the current and previous columns of every component
+    def _column_groups(self):
+        yield from self.columns.values()
+        yield from self.previous.values()
+
+    # Keep entity debug output short, since every entity points back at its archetype
+    def __repr__(self):
+        return f"Archetype({sorted(self.components)}, {len(self.entities)} entities)"
+
+
+# A SpatialHash is a broadphase index which buckets entities into a uniform grid of square cells by their bounding
+# rect. Finding what's near a rect only has to look at the entities in the few cells it covers, so collision checks
+# stay cheap no matter how many entities are in the world:
+#
+#     for other in spatial_hash.query(player_rect):
+#         # Narrow phase check goes here
+#
+# Entries are updated incrementally: update() only touches the grid when an entity crosses into different cells,
+# so calling it every frame for things that move is cheap. Register it with World.register_index() to have removed
+# entities taken out automatically.
+class SpatialHash:
+    def __init__(self, cell_size):
+        self.cell_size = cell_size
+        # Map of (column, row) cells to the entities overlapping them, keyed by ID
+        self.cells = {}
+        self.spans = {}  # Index mapping entity IDs to the range of cells they cover
+
+    # Inserts an entity with the given bounding rect, or moves it if it's already in the grid.
+    # Any object with x, y, width and height works as a rect, such as a pygame.Rect
+    def update(self, entity, rect):
+        span = self._span(rect.x, rect.y, rect.width, rect.height)
+        old_span = self.spans.get(entity.id)
+        if span == old_span:
+            return
+        if old_span is not None:
+            self._unlink(entity, old_span)
+        self.spans[entity.id] = span
+        left, top, right, bottom = span
+        for column in range(left, right + 1):
+            for row in range(top, bottom + 1):
+                self.cells.setdefault((column, row), {})[entity.id] = entity
+
+    def remove(self, entity):
+        span = self.spans.pop(entity.id, None)
+        if span is not None:
+            self._unlink(entity, span)
+
+    # Returns every entity in a cell overlapped by the given rect. These are only candidates, which may not actually
+    # overlap the rect themselves, so follow this up with a proper collision test
+    def query(self, rect):
+        left, top, right, bottom = self._span(rect.x, rect.y, rect.width, rect.height)
+        found = {}
+        for column in range(left, right + 1):
+            for row in range(top, bottom + 1):
+                cell = self.cells.get((column, row))
+                if cell:
+                    found.update(cell)
+        return list(found.values())
+
+    def __len__(self):
+        return len(self.spans)
+
+    # Internal helper which works out the (inclusive) range of cells a rect covers
+    def _span(self, x, y, width, height):
+        size = self.cell_size
+        return (
+            int(x // size),
+            int(y // size),
+            int((x + max(width - 1, 0)) // size),
+            int((y + max(height - 1, 0)) // size),
+        )
+
+    # Internal helper which takes an entity out of every cell in a span, dropping cells that end up empty
+    def _unlink(self, entity, span):
+        left, top, right, bottom = span
+        for column in range(left, right + 1):
+            for row in range(top, bottom + 1):
+                cell = self.cells[(column, row)]
+                del cell[entity.id]
+                if not cell:
+                    del self.cells[(column, row)]
+
+
 # Create a singleton state for the world. This bundles up all the class local methods and datums into one
 # singleton instead of many small singletons spread across several classes
 WORLD = World()
@@ -154,12 +629,12 @@ WORLD = World()
 #
 #     >>> e = WORLD.gen_entity()
 #     >>> print(e)
-#     {'id': '5afec678-4c4e-44a9-be74-8764f62b61fd', 'components': []}
+#     {'id': 5, 'components': []}
 #     >>>
 #     >>> e.attach(Component('meta'))
 #     >>> print(e)
 #     {'components': ['meta'],
-#      'id': '5afec678-4c4e-44a9-be74-8764f62b61fd',
+#      'id': 5,
 #      'meta': <ecs.Component object at 0x108a1e400>}
 #     >>> e.meta.name = 'Player'
 #
@@ -198,7 +673,15 @@ WORLD = World()
 # The damage-calculation system simply looks up the entity using
 # this reverse index.
 #
-#     target = WORLD.get('47d78b7e-8c5c-417b-8f46-be0de7c0b62d')
+#     target = WORLD.get(4294967301)
+#
+# IDs are integers rather than UUIDs, so they're cheap to create, hash
+# and compare. Each one holds the entity's slot index in its low 32 bits
+# (ENTITY_SLOT_BITS) and that slot's generation in the bits above, so
+# the ID above is slot 5 in its first reuse (generation 1). When an
+# entity is removed its ID is retired for good: the slot it used is
+# recycled with a bumped generation, so looking up the old ID returns
+# None instead of whatever entity took its place.
 #
 # The second index is used in implementing systems that deal with
 # all entities having a particular component attached. For example,
@@ -211,6 +694,10 @@ class Entity(object):
     def __init__(self, id):
         self.id = id
         self.components = []
+        self.archetype = None
+        self.row = None
+        # Attached ColumnarComponents, which read their values from this entity's table row
+        self.columnar = []
 
     def attach(self, component: Component, namespace: str = None):
         # Append component name to list of components
@@ -220,8 +707,16 @@ class Entity(object):
         self.__dict__[key] = component
         # Add to component index
         if component.metatype not in WORLD.cindex:
-            WORLD.cindex[component.metatype] = []
-        WORLD.cindex[component.metatype].append(self)
+            WORLD.cindex[component.metatype] = EntitySet()
+        WORLD.cindex[component.metatype].add(self)
+        # Columnar components need their fields registered before a table storing them can be created
+        if isinstance(component, ColumnarComponent):
+            WORLD.schemas.setdefault(component.metatype, component.fields)
+        # Move this entity into the table for its new set of components
+        WORLD._move_to_archetype(self, self.archetype.components | {component.metatype})
+        if isinstance(component, ColumnarComponent):
+            component.bind(self)
+            self.columnar.append(component)
 
     # Method that allows indexing an entity like a dictionary. Makes IDE experience better since static analyzers can't see fields created at runtime
     def __getitem__(self, key):
@@ -273,7 +768,16 @@ class Entity(object):
 #             # Do something here that modifies state or generates events
 #
 #             # Inject any new events at the end
-#             world.inject_event({'type': 'move', 'data': randstr(10)})
+#             world.inject_event(MoveEvent(randstr(10)))
+#
+# where MoveEvent is a kind of Event:
+#
+#     class MoveEvent(Event):
+#         __slots__ = ('data',)
+#         type = 'move'
+#
+#         def __init__(self, data):
+#             self.data = data
 #
 # Note that above, the process() function first gets all pending events,
 # runs some processing code, and finally, if needed, emits a new set of
@@ -286,8 +790,29 @@ class Entity(object):
 # set operators, etc. before arriving at the entities you need and
 # continuing with the loop.
 #
-# Here's a made-up example that illustrates how to do this using Python's
-# built-in set operations:
+# When you need every entity having several components at once, use
+# World.query(), which walks the archetype tables directly instead of
+# building sets every frame:
+#
+#     def process(self, world):
+#         for entity in world.query('movement', 'position'):
+#             # Rest of the loop goes here and uses 'entity'
+#
+# Systems should also declare which components they read and write, and
+# which events they emit (the events they consume are the ones they
+# subscribe to), so the world knows which systems can run at the same time:
+#
+#     class MovementSystem(System):
+#         reads = {'context', 'physics'}
+#         writes = {'position'}
+#         emits = ('move',)
+#
+# Systems which create or remove entities, or attach components, change
+# the world's shared indexes, so they must set `structural = True` and are
+# always run on their own. So are systems which don't declare anything.
+#
+# For anything fancier, here's a made-up example that illustrates how to
+# do this using Python's built-in set operations:
 #
 #     def process(self, world):
 #         ent_with_move = set(Entity.filter('movement'))
@@ -298,19 +823,73 @@ class Entity(object):
 #         # Rest of the loop goes here and uses 'entities'
 #
 class System(object):
+    # Names of the components this system reads and writes, or None if it hasn't said
+    reads = None
+    writes = None
+    # Types of the events this system injects
+    emits = ()
+    # Whether this system creates or removes entities, or attaches components to them
+    structural = False
+
     def __init__(self):
         self.events = []
+        # The list pending() handed out last time, which gets reused once it's handed out again
+        self.spare_events = []
+        # Types of the events this system is subscribed to
+        self.consumes = []
 
     def subscribe(self, event_type):
-        if event_type not in WORLD.subscriptions:
-            WORLD.subscriptions[event_type] = []
-        WORLD.subscriptions[event_type].append(self)
-
+        subscribers = WORLD.subscriptions.get(event_type, ())
+        WORLD.subscriptions[event_type] = subscribers + (self,)
+        self.consumes.append(event_type)
+
+    # Whether this system has said what it reads and writes
+    def declared(self):
+        return self.reads is not None or self.writes is not None
+
+    # Whether running this system at the same time as another one could change what either of them does.
+    # Events are only handed out between frames, so consuming an event never clashes with emitting it, but two
+    # systems emitting the same type of event would change the order their events arrive in
+    def conflicts(self, other):
+        if not self.declared() or not other.declared():
+            return True
+        if self.structural or other.structural:
+            return True
+        reads, writes = set(self.reads or ()), set(self.writes or ())
+        other_reads, other_writes = set(other.reads or ()), set(other.writes or ())
+        return bool(
+            writes & (other_reads | other_writes)
+            or other_writes & reads
+            or set(self.emits) & set(other.emits)
+        )
+
+    # Get pending events and clear queue. The list returned is reused, so it's only good until the next call
     def pending(self):
-        # Get pending events and clear queue
         ret = self.events
-        self.events = []
+        self.events = self.spare_events
+        self.events.clear()
+        self.spare_events = ret
         return ret
 
     def process(self, events, world):
         pass
+
+
+# Groups systems into stages, which get run in order. Systems in the same stage don't conflict with each other, so
+# they can run at the same time, and every system still runs after any system registered before it which it conflicts
+# with. So every system sees the same world it would if all the systems ran one at a time in the order they were
+# registered. Structural systems, and systems which haven't declared what they read and write, conflict with
+# everything, so they run alone
+def schedule(systems):
+    stages = []
+    placed = []  # Pairs of systems and the stage they were put in
+    for system in systems:
+        stage = 0
+        for (other, other_stage) in placed:
+            if other_stage >= stage and system.conflicts(other):
+                stage = other_stage + 1
+        if stage == len(stages):
+            stages.append([])
+        stages[stage].append(system)
+        placed.append((system, stage))
+    return stages
@@ -1,5 +1,7 @@
 import pygame
 
+from ecs import Event
+
 SCENE_REFOCUS = pygame.event.custom_type()
 NEW_GAME = pygame.event.custom_type()
 CONTINUE = pygame.event.custom_type()
@@ -18,3 +20,43 @@ EQUIP_BUY_MORE_FUEL = pygame.event.custom_type()
 QUIT = pygame.QUIT
 LOAD = pygame.event.custom_type()
 VICTORY = pygame.event.custom_type()
+
+
+# Events sent between systems through World.inject_event, rather than through pygame's event queue
+class SoundEvent(Event):
+    __slots__ = ("action", "sound")
+    type = "sound"
+
+    def __init__(self, action, sound):
+        self.action = action  # "start" to loop, "stop", or "play" once
+        self.sound = sound  # Name of the sound in resources/audio.json
+
+
+class PhysicsForceEvent(Event):
+    __slots__ = ("magnitude", "angle")
+    type = "physics_force"
+
+    def __init__(self, magnitude, angle):
+        self.magnitude = magnitude
+        self.angle = angle
+
+
+class PhysicsFrameResetEvent(Event):
+    __slots__ = ()
+    type = "physics_frame_reset"
+
+
+class GlideEvent(Event):
+    __slots__ = ()
+    type = "glide"
+
+
+class MoveEvent(Event):
+    __slots__ = ()
+    type = "move"
+
+
+# Events without any fields only ever need making once
+PHYSICS_FRAME_RESET = PhysicsFrameResetEvent()
+GLIDE = GlideEvent()
+MOVE = MoveEvent()
@@ -0,0 +1,203 @@
+import argparse
+import json
+import os
+import random
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor
+
+import pygame
+
+from common_components import ContextComponent
+from ecs import WORLD, Component
+from scene import SceneSwitch
+from scenes.game import Controls, GameScene, apply_upgrades, calculate_altitude
+from scenes.victory import VictoryScene
+
+# Upgrades a player starts a headless flight with, in the same format as a save file
+DEFAULT_LOADOUT = {
+    "currency": 0,
+    "hasCloudSleeves": 0,
+    "hasWings": 0,
+    "hasJetBoots": 0,
+    "extraFuel": 0,
+}
+
+# How a single flight turned out
+FlightResult = namedtuple(
+    "FlightResult",
+    ["distance", "max_altitude", "currency", "victory", "crashed", "steps"],
+)
+
+# A single flight for simulate_many() to run. The input source must be picklable (e.g. an AnglePolicy),
+# since it gets sent to a worker process
+FlightJob = namedtuple(
+    "FlightJob",
+    ["seed", "loadout", "input_source", "max_steps"],
+    defaults=[None, None, 60 * 60 * 5],
+)
+
+# Totals and averages over a batch of flights
+FlightStats = namedtuple(
+    "FlightStats",
+    [
+        "flights",
+        "victories",
+        "crashes",
+        "mean_distance",
+        "max_distance",
+        "mean_max_altitude",
+        "max_altitude",
+        "mean_currency",
+        "total_currency",
+    ],
+)
+
+
+class AnglePolicy:
+    """
+    A scripted input source which jumps straight away, steers towards a fixed angle,
+    and fires a boost whenever the player slows down below a given speed.
+    Like any input source, it's called with the step's events and the world, and returns Controls.
+    """
+
+    def __init__(self, angle=-20, boost_below=8):
+        self.angle = angle
+        self.boost_below = boost_below
+
+    def __call__(self, events, world):
+        player_entity = world.find_entity("player")
+        angle = player_entity.rotation.angle
+        boost = (
+            player_entity.player.numBoosts > 0
+            and player_entity.physics.velocity < self.boost_below
+        )
+        return Controls(
+            jump=True,
+            rotate_left=angle > self.angle,
+            rotate_right=angle < self.angle,
+            slow_rotation=abs(angle - self.angle) < 2,
+            boosts=1 if boost else 0,
+        )
+
+
+# Sets pygame up to run without a window or sound card. Only fonts and the event queue are needed to run GameScene
+def init():
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+    pygame.display.init()
+    pygame.font.init()
+
+
+# Simulates one whole flight as fast as possible, without rendering, and returns a FlightResult.
+# The flight ends when the player crashes, reaches the moon, or runs out of steps (each step is 1/60th of a second)
+def run_flight(input_source=None, loadout=None, seed=None, max_steps=60 * 60 * 5):
+    random.seed(seed)
+    pygame.event.clear()
+
+    # Start from an empty world, set up the same way main() does, but with an off-screen surface to "render" to
+    WORLD.reset()
+    settings = Component.load_from_json("settings")
+    WORLD.gen_entity().attach(settings)
+    screen = pygame.Surface((settings["height"], settings["width"]))
+    WORLD.gen_entity().attach(ContextComponent(screen, None, screen))
+
+    scene = GameScene(input_source or AnglePolicy())
+    scene.setup(WORLD)
+
+    player_entity = WORLD.find_entity("player")
+    apply_upgrades(player_entity, dict(DEFAULT_LOADOUT, **(loadout or {})))
+    start_x = player_entity.position.x
+    start_currency = player_entity.player.currency
+    max_altitude = -calculate_altitude(player_entity, screen)
+
+    victory = False
+    crashed = False
+    steps = 0
+    while steps < max_steps:
+        steps += 1
+        switch_event = scene.update(pygame.event.get(), WORLD)
+        max_altitude = max(max_altitude, -calculate_altitude(player_entity, screen))
+
+        if switch_event is not None and switch_event["type"] != SceneSwitch.Nothing:
+            victory = isinstance(switch_event["scene"], VictoryScene)
+            crashed = not victory
+            break
+
+    result = FlightResult(
+        distance=player_entity.position.x - start_x,
+        max_altitude=max_altitude,
+        currency=player_entity.player.currency - start_currency,
+        victory=victory,
+        crashed=crashed,
+        steps=steps,
+    )
+    scene.teardown(WORLD)
+    return result
+
+
+# Runs one FlightJob. Lives at module level so worker processes can unpickle it
+def _run_job(job):
+    return run_flight(job.input_source, job.loadout, job.seed, job.max_steps)
+
+
+# Rolls a batch of FlightResults up into FlightStats, without keeping them all in memory
+def summarize(results):
+    flights = victories = crashes = 0
+    total_distance = total_altitude = total_currency = 0
+    max_distance = max_altitude = float("-inf")
+    for result in results:
+        flights += 1
+        victories += result.victory
+        crashes += result.crashed
+        total_distance += result.distance
+        total_altitude += result.max_altitude
+        total_currency += result.currency
+        max_distance = max(max_distance, result.distance)
+        max_altitude = max(max_altitude, result.max_altitude)
+
+    count = max(flights, 1)
+    return FlightStats(
+        flights=flights,
+        victories=victories,
+        crashes=crashes,
+        mean_distance=total_distance / count,
+        max_distance=max_distance,
+        mean_max_altitude=total_altitude / count,
+        max_altitude=max_altitude,
+        mean_currency=total_currency / count,
+        total_currency=total_currency,
+    )
+
+
+# Runs many independent flights across a pool of worker processes (one per core by default), and returns their FlightStats.
+# Every worker has its own WORLD, so flights never share state. Jobs are handed out in chunks to keep the overhead of
+# sending them between processes low
+def simulate_many(jobs, workers=None, chunksize=64):
+    with ProcessPoolExecutor(max_workers=workers, initializer=init) as executor:
+        return summarize(executor.map(_run_job, jobs, chunksize=chunksize))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Simulate flights without a window")
+    parser.add_argument("--flights", type=int, default=1000)
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--seed", type=int, default=0, help="seed of the first flight")
+    parser.add_argument("--angle", type=float, default=-20, help="angle to steer for")
+    parser.add_argument(
+        "--loadout",
+        type=json.loads,
+        default="{}",
+        help='upgrades as JSON, e.g. \'{"hasJetBoots": 1, "extraFuel": 2}\'',
+    )
+    args = parser.parse_args()
+
+    policy = AnglePolicy(args.angle)
+    print(
+        simulate_many(
+            (
+                FlightJob(args.seed + i, args.loadout, policy)
+                for i in range(args.flights)
+            ),
+            workers=args.workers,
+        )
+    )
@@ -1,19 +1,28 @@
 import pygame
 
+from assets import ASSETS
+from atlas import load_atlas
 from button import ButtonSystem
 from common_components import ContextComponent
 from ecs import WORLD, Component
-from scene import SceneManager
+from scene import SceneManager, SceneSwitch
 from scenes.title import TitleScene
 from sound import AudioSystem
-from utils import find_data_file
+
+# The game simulation always advances in fixed steps at this rate, however fast or slow we render.
+# All of the physics constants are tuned for this rate
+SIMULATION_RATE = 60
+# Rendering is capped at this many frames per second (vsync will usually cap it lower)
+MAX_FRAME_RATE = 240
+# After a long stall, only catch up by this many steps, rather than freezing while the simulation races ahead
+MAX_STEPS_PER_FRAME = 5
 
 
 def main():
     # Initialize pygame before we do anything else
     pygame.init()
 
-    programIcon = pygame.image.load(find_data_file("resources/icarus_icon.png"))
+    programIcon = ASSETS.image("resources/icarus_icon.png")
     pygame.display.set_icon(programIcon)
 
     # Initialize global systems in the game world
@@ -32,6 +41,9 @@ def main():
     )
     pygame.display.set_caption(settings["title"] + ": " + settings["subtitle"])
 
+    # Small images get drawn from one atlas, which is built the first time the game runs
+    ASSETS.use_atlas(*load_atlas())
+
     # Store our dynamic resources that are created at runtime in the game world
     background = pygame.Surface(screen.get_size())
     background = background.convert()
@@ -47,22 +59,49 @@ def main():
     # Initialize a SceneManager with our title screen
     manager = SceneManager(title_screen, WORLD)
 
+    # Real time that has passed but hasn't been simulated yet
+    step = 1 / SIMULATION_RATE
+    accumulator = 0.0
+    # Events that haven't been seen by a simulation step yet
+    pending_events = []
+
     # BIG GAME LOOP
     while game["context"]["running"]:
-        game["context"]["clock"].tick(60)
+        elapsed = game["context"]["clock"].tick(MAX_FRAME_RATE) / 1000
+        accumulator = min(accumulator + elapsed, step * MAX_STEPS_PER_FRAME)
 
         # Process game wide events, most likely only QUIT
         events = pygame.event.get()
         for event in events:
             if event.type == pygame.QUIT:
                 game["context"]["running"] = False
-
-        # Update the current scene
-        switch_event = manager.update(events, WORLD)
+        pending_events.extend(events)
+
+        # Update the current scene once per fixed step, running as many steps as it takes to catch up to real time.
+        # On fast machines that can be none at all, in which case the events wait for the next frame's step
+        switch_event = manager.nothing()
+        steps = 0
+        while accumulator >= step:
+            accumulator -= step
+            steps += 1
+            switch_event = manager.update(pending_events, WORLD)
+            pending_events = []
+
+            # Stop stepping as soon as the scene wants to switch, since that only happens after rendering
+            if switch_event["type"] != SceneSwitch.Nothing:
+                break
+
+        # Let scenes know how far the simulation advanced this frame, and how far we are between the last step and the next
+        game["context"]["steps"] = steps
+        game["context"]["interpolation"] = accumulator / step
 
         # Render the current scene
-        manager.render(WORLD)
-        pygame.display.flip()  # Double buffers whatever was on the screen object to the actual display
+        dirty_rects = manager.render(WORLD)
+        if dirty_rects is None:
+            pygame.display.flip()  # Double buffers whatever was on the screen object to the actual display
+        else:
+            # Only copies the parts of the screen which changed
+            pygame.display.update(dirty_rects)
 
         # Finally switch scenes in the scene manager
         manager.switch(switch_event, WORLD)
@@ -0,0 +1,35 @@
+from operator import itemgetter
+
+
+class RenderQueue:
+    """
+    Collects everything to be drawn onto a surface over a frame, then draws it all with a single blits() call.
+    Items are drawn lowest layer first, and in the order they were submitted within a layer.
+
+    It can be passed to helpers which draw with get_size() and blits() in place of the surface itself.
+    """
+
+    def __init__(self, target):
+        self.target = target
+        # List of (layer, blit) pairs, where blit is a sequence blits() accepts
+        self.items = []
+
+    # Queues source to be drawn at dest on the given layer. If area is given, only that part of source is drawn
+    def submit(self, source, dest, layer=0, area=None):
+        if area is None:
+            self.items.append((layer, (source, dest)))
+        else:
+            self.items.append((layer, (source, dest, area)))
+
+    # Same as Surface.blits, except the blits are queued on the given layer, so there's nothing to return
+    def blits(self, blit_sequence, doreturn=False, layer=0):
+        self.items.extend((layer, blit) for blit in blit_sequence)
+
+    def get_size(self):
+        return self.target.get_size()
+
+    # Draws everything queued since the last flush, and empties the queue
+    def flush(self):
+        self.items.sort(key=itemgetter(0))
+        self.target.blits([blit for _, blit in self.items], doreturn=False)
+        self.items.clear()
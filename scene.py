@@ -7,6 +7,11 @@ import game_events
 
 # All scenes should implement this class's interface
 class Scene:
+    # While another scene is drawn over this one, SceneManager keeps a snapshot of what this scene drew and reuses it,
+    # rather than rendering this scene again every frame. Set this to True to have the scene rendered again next frame
+    # (e.g. from render, if the scene keeps animating while covered)
+    dirty = False
+
     # This method get called once when the scene is first added to the game. This allows the Scene to do one time setup using resources stored in the world
     def setup(self, world):
         pass
@@ -17,6 +22,8 @@ class Scene:
 
     # Returns a scene switch event (see the helper functions in SceneManager to generate them)
     # This method should the scene
+    # It can return a list of rects covering everything on screen which changed since the last frame, so only those
+    # parts of the display get updated. Returning None (the default) updates the whole display
     def render(self, world):
         pass
 
@@ -47,6 +54,11 @@ class SceneManager:
     def __init__(self, scene, world):
         scene.setup(world)
         self.scenes.append(scene)
+        # Scenes which were drawn last frame, bottom first
+        self.rendered = []
+        # What the scenes underneath the top one looked like, and which scenes those were
+        self.snapshot = None
+        self.snapshot_scenes = []
 
     # Method to get the current scene
     def _current(self):
@@ -83,18 +95,72 @@ class SceneManager:
         # Just in case the update function didn't return any state transition, default to do nothing
         return self._current().update(events, world) or self.nothing()
 
-    # Calls render on all appropriate scenes
+    # Calls render on all appropriate scenes, and returns the rects of the screen which changed since the last frame.
+    # Returns None if the whole screen needs updating, either because a scene said so or because different scenes are showing
     def render(self, world):
-        self._render_all_scenes(self.scenes, world)
-
-    # Pravate helper to render all appropriate scenes starting from the bottom up (uses recursion to bottom up traverse)
-    def _render_all_scenes(self, scenes, world):
+        visible = self._visible_scenes(self.scenes)
+        covered = visible[:-1]
+        dirty_rects = []
+
+        # Anything could have happened underneath while other scenes were showing, like a game being played between pauses
+        if visible != self.rendered:
+            self.snapshot_scenes = []
+
+        if self._snapshot_valid(covered):
+            # Nothing underneath has changed, so just put the snapshot back
+            screen = world.find_component("context")["screen"]
+            screen.blit(self.snapshot, (0, 0))
+        else:
+            for scene in covered:
+                scene.dirty = False
+                rects = scene.render(world)
+                if rects is None:
+                    dirty_rects = None
+                elif dirty_rects is not None:
+                    dirty_rects.extend(rects)
+            self._take_snapshot(covered, world)
+
+        rects = visible[-1].render(world)
+        if rects is None:
+            dirty_rects = None
+        elif dirty_rects is not None:
+            dirty_rects.extend(rects)
+
+        if visible != self.rendered:
+            dirty_rects = None
+        self.rendered = visible
+
+        return None if dirty_rects is None else merge_rects(dirty_rects)
+
+    # Private helper to check whether the snapshot still shows what the covered scenes would draw
+    def _snapshot_valid(self, covered):
+        return (
+            len(covered) > 0
+            and covered == self.snapshot_scenes
+            and not any(scene.dirty for scene in covered)
+        )
+
+    # Private helper to remember what the covered scenes drew, as long as none of them need rendering again
+    def _take_snapshot(self, covered, world):
+        if not covered or any(scene.dirty for scene in covered):
+            self.snapshot_scenes = []
+            return
+
+        screen = world.find_component("context")["screen"]
+        if self.snapshot is None or self.snapshot.get_size() != screen.get_size():
+            self.snapshot = screen.copy()
+        else:
+            self.snapshot.blit(screen, (0, 0))
+        self.snapshot_scenes = covered
+
+    # Pravate helper to find all appropriate scenes to render, from the bottom up (uses recursion to bottom up traverse)
+    def _visible_scenes(self, scenes):
         assert len(scenes) > 0
         last = scenes[-1]
         rest = scenes[:-1]
         if last.render_previous() is True:
-            self._render_all_scenes(rest, world)
-        last.render(world)
+            return self._visible_scenes(rest) + [last]
+        return [last]
 
     # Helper methods to generate a sceenswitch event for you instead of having to create one inline
     @staticmethod
@@ -116,3 +182,16 @@ class SceneManager:
     @staticmethod
     def new_root(scene):
         return {"type": SceneSwitch.New_Root, "scene": scene}
+
+
+# Merges overlapping rects together, so no part of the display gets updated twice
+def merge_rects(rects):
+    merged = []
+    for rect in rects:
+        rect = pygame.Rect(rect)
+        index = rect.collidelist(merged)
+        while index != -1:
+            rect.union_ip(merged.pop(index))
+            index = rect.collidelist(merged)
+        merged.append(rect)
+    return merged
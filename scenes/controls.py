@@ -18,6 +18,18 @@ class ControlsScene(Scene):
     def setup(self, world):
         context = world.find_component("context")
         background = context["background"]
+        screen = context["screen"]
+
+        # The instructions never change, so draw them once
+        self.panel = pygame.Surface((screen.get_width() // 2 - 30, 210))
+        text = self.font.render(
+            "Press right and left to rotate while flying.", True, (245, 245, 245)
+        )
+        self.panel.blit(text, (10, 10))
+        text = self.font.render("Don't crash into the ground.", True, (245, 245, 245))
+        self.panel.blit(text, (10, 50))
+        text = self.font.render("Shoot for the moon.", True, (245, 245, 245))
+        self.panel.blit(text, (10, 90))
 
         rect = pygame.Rect(0, 0, 190, 49)
         rect.centerx = background.get_width() // 2
@@ -43,22 +55,12 @@ class ControlsScene(Scene):
         context = world.find_component("context")
         screen = context["screen"]
 
-        surf = pygame.Surface((screen.get_width() // 2 - 30, 210))
-        screen.blit(surf, (screen.get_width() // 4 + 15, screen.get_height() // 2 - 30))
-
-        text = self.font.render(
-            "Press right and left to rotate while flying.", True, (245, 245, 245)
+        screen.blit(
+            self.panel, (screen.get_width() // 4 + 15, screen.get_height() // 2 - 30)
         )
-        screen.blit(text, (screen.get_width() // 4 + 25, screen.get_height() // 2 - 20))
-
-        text = self.font.render("Don't crash into the ground.", True, (245, 245, 245))
-        screen.blit(text, (screen.get_width() // 4 + 25, screen.get_height() // 2 + 20))
-
-        text = self.font.render("Shoot for the moon.", True, (245, 245, 245))
-        screen.blit(text, (screen.get_width() // 4 + 25, screen.get_height() // 2 + 60))
 
         # Display the buttons
-        render_all_buttons(screen, world)
+        return render_all_buttons(screen, world)
 
     def render_previous(self):
         return True
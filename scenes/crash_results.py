@@ -8,7 +8,7 @@ from pygame.event import Event, post
 import scenes.equip
 import scenes.title
 from button import ButtonComponent, render_all_buttons
-from game_events import PAUSE_QUIT_TO_MENU, PAUSE_SAVE_AND_QUIT
+from game_events import PAUSE_QUIT_TO_MENU, PAUSE_SAVE_AND_QUIT, SoundEvent
 from scene import Scene, SceneManager
 from utils import APP_AUTHOR, APP_NAME, find_data_file
 
@@ -25,6 +25,11 @@ class CrashResultsScene(Scene):
     def setup(self, world):
         context = world.find_component("context")
         background = context["background"]
+        screen = context["screen"]
+
+        # Darken whatever is behind us. It never changes, so only make it once
+        self.overlay = pygame.Surface(screen.get_size(), pygame.SRCALPHA)
+        self.overlay.fill((0, 0, 0, 175))
 
         player_entity = world.find_entity("player")
 
@@ -98,25 +103,13 @@ class CrashResultsScene(Scene):
             elif event.type == PAUSE_SAVE_AND_QUIT:
                 self._save(settings["save_file"], world)
                 context["paused"] = False
-                world.inject_event(
-                    {
-                        "type": "sound",
-                        "action": "stop",
-                        "sound": "background_music",
-                    }
-                )
+                world.inject_event(SoundEvent.shared("stop", "background_music"))
 
                 self.teardown(world)
                 return SceneManager.replace(scenes.equip.EquipScene())
 
         if exiting:
-            world.inject_event(
-                {
-                    "type": "sound",
-                    "action": "stop",
-                    "sound": "background_music",
-                }
-            )
+            world.inject_event(SoundEvent.shared("stop", "background_music"))
             return SceneManager.new_root(scenes.title.TitleScene())
 
         world.process_all_systems(events)
@@ -127,17 +120,13 @@ class CrashResultsScene(Scene):
         screen = context["screen"]
 
         # Blit the text to the screen over top of the background surface
-        overlay = pygame.Surface(
-            (screen.get_width(), screen.get_height()), pygame.SRCALPHA
-        )
-        overlay.fill((0, 0, 0, 175))
-        screen.blit(overlay, overlay.get_rect())
+        screen.blit(self.overlay, (0, 0))
 
         # Render the static pause screen elements
         self.pause_screen.draw(screen)
 
         # Display the buttons
-        render_all_buttons(screen, world)
+        return render_all_buttons(screen, world)
 
     def _save(self, save_file, world):
         if not os.path.exists(user_data_dir(APP_NAME, APP_AUTHOR)):
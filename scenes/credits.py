@@ -1,29 +1,37 @@
 import pygame
 from pygame.event import Event, post
 
+from assets import ASSETS
 from button import ButtonComponent, render_all_buttons
 from game_events import BACK
+from render import RenderQueue
 from scene import Scene, SceneManager
-from utils import find_data_file
+
+DPCOMIC_FONT = "resources/dpcomic-font/DpcomicRegular-p3jD.ttf"
+ATARI_FONT = "resources/atari-font/AtariFontFullVersion-ZJ23.ttf"
+ARCADE_FONT = "resources/arcade-classic-font/ArcadeClassic-ov2x.ttf"
 
 
 class CreditsScene(Scene):
     def __init__(self):
-        self.font = pygame.font.Font(
-            find_data_file("resources/dpcomic-font/DpcomicRegular-p3jD.ttf"), 36
-        )
-        self.atari_font = pygame.font.Font(
-            find_data_file("resources/atari-font/AtariFontFullVersion-ZJ23.ttf"), 20
-        )
-        self.arcade_font = pygame.font.Font(
-            find_data_file("resources/arcade-classic-font/ArcadeClassic-ov2x.ttf"), 26
-        )
-
         self.scroll_offset = 0
 
     def setup(self, world):
         context = world.find_component("context")
         background = context["background"]
+        screen = context["screen"]
+
+        # The scrolling area, and everything that scrolls through it drawn once up front.
+        # The credits never change, so each frame only has to copy the visible part across
+        self.surf = pygame.Surface(
+            (screen.get_width() // 2 + 40, screen.get_height() - 280 - 100)
+        )
+        self.credits = self._draw_credits(
+            self.surf.get_width(), self.surf.get_height() + 180
+        )
+        # How far the credits were scrolled when they were last drawn
+        self.rendered_offset = None
+        self.render_queue = RenderQueue(screen)
 
         rect = pygame.Rect(0, 0, 190, 49)
         rect.centerx = background.get_width() // 2
@@ -54,55 +62,8 @@ class CreditsScene(Scene):
         context = world.find_component("context")
         screen = context["screen"]
 
-        surf = pygame.Surface(
-            (screen.get_width() // 2 + 40, screen.get_height() - 280 - 100)
-        )
-
-        text = self.font.render("Programmed By:", True, (245, 245, 245))
-        surf.blit(text, (20, 20 + self.scroll_offset))
-        text = self.font.render("Austin Decker", True, (245, 245, 245))
-        surf.blit(text, (20, 60 + self.scroll_offset))
-        text = self.font.render("Dan Muckerman", True, (245, 245, 245))
-        surf.blit(text, (20, 95 + self.scroll_offset))
-        text = self.font.render("Chris Yealy", True, (245, 245, 245))
-        surf.blit(text, (20, 130 + self.scroll_offset))
-
-        text = self.font.render("Sprites By:", True, (245, 245, 245))
-        surf.blit(text, (surf.get_width() // 2 + 60, 20 + self.scroll_offset))
-        text = self.font.render("Austin Forry", True, (245, 245, 245))
-        surf.blit(text, (surf.get_width() // 2 + 60, 60 + self.scroll_offset))
-
-        prod = pygame.sprite.Sprite()
-        prod.image = self.font.render(
-            "A Technical Incompetence Production", True, (240, 240, 240)
-        )
-        prod.rect = prod.image.get_rect(
-            centerx=surf.get_width() // 2, centery=190 + self.scroll_offset
-        )
-        surf.blit(prod.image, prod.rect)
-
-        text = self.font.render("Sound fx and buttons:", True, (245, 245, 245))
-        surf.blit(text, (20, 290 + self.scroll_offset))
-        text = self.font.render("kenney.nl", True, (245, 245, 245))
-        surf.blit(text, (20, 330 + self.scroll_offset))
-
-        text = self.font.render("Music:", True, (245, 245, 245))
-        surf.blit(text, (surf.get_width() // 2 + 60, 290 + self.scroll_offset))
-        text = self.font.render("freepd.com", True, (245, 245, 245))
-        surf.blit(text, (surf.get_width() // 2 + 60, 330 + self.scroll_offset))
-
-        text = self.font.render("Fonts Used:", True, (245, 245, 245))
-        surf.blit(text, (20, 380 + self.scroll_offset))
-        text = self.atari_font.render(
-            "Atari Font by Genshichi Yasui", True, (245, 245, 245)
-        )
-        surf.blit(text, (20, 420 + self.scroll_offset))
-        text = self.arcade_font.render(
-            "Arcade Classic Font by Koen Hachmang", True, (245, 245, 245)
-        )
-        surf.blit(text, (20, 445 + self.scroll_offset))
-        text = self.font.render("DpComic Font by codeman38", True, (245, 245, 245))
-        surf.blit(text, (20, 468 + self.scroll_offset))
+        surf = self.surf
+        surf.blit(self.credits, (0, self.scroll_offset))
 
         # Arrows to indicate scrolling is available
         if self.scroll_offset < 0:
@@ -120,10 +81,49 @@ class CreditsScene(Scene):
             )
             pygame.draw.polygon(surf, (245, 245, 245), down_triangle)
 
-        screen.blit(surf, (screen.get_width() // 4 - 20, 280))
+        rect = surf.get_rect(x=screen.get_width() // 4 - 20, y=280)
+        self.render_queue.submit(surf, rect)
 
         # Display the buttons
-        render_all_buttons(screen, world)
+        dirty_rects = render_all_buttons(self.render_queue, world)
+        self.render_queue.flush()
+        if self.scroll_offset != self.rendered_offset:
+            dirty_rects.append(rect)
+            self.rendered_offset = self.scroll_offset
+        return dirty_rects
+
+    # Draws all of the credits onto a surface tall enough to scroll through
+    def _draw_credits(self, width, height):
+        surf = pygame.Surface((width, height))
+
+        def text(string, font=DPCOMIC_FONT, size=36, color=(245, 245, 245)):
+            return ASSETS.text(font, size, string, color)
+
+        surf.blit(text("Programmed By:"), (20, 20))
+        surf.blit(text("Austin Decker"), (20, 60))
+        surf.blit(text("Dan Muckerman"), (20, 95))
+        surf.blit(text("Chris Yealy"), (20, 130))
+
+        surf.blit(text("Sprites By:"), (surf.get_width() // 2 + 60, 20))
+        surf.blit(text("Austin Forry"), (surf.get_width() // 2 + 60, 60))
+
+        prod = text("A Technical Incompetence Production", color=(240, 240, 240))
+        surf.blit(prod, prod.get_rect(centerx=surf.get_width() // 2, centery=190))
+
+        surf.blit(text("Sound fx and buttons:"), (20, 290))
+        surf.blit(text("kenney.nl"), (20, 330))
+
+        surf.blit(text("Music:"), (surf.get_width() // 2 + 60, 290))
+        surf.blit(text("freepd.com"), (surf.get_width() // 2 + 60, 330))
+
+        surf.blit(text("Fonts Used:"), (20, 380))
+        surf.blit(text("Atari Font by Genshichi Yasui", ATARI_FONT, 20), (20, 420))
+        surf.blit(
+            text("Arcade Classic Font by Koen Hachmang", ARCADE_FONT, 26), (20, 445)
+        )
+        surf.blit(text("DpComic Font by codeman38"), (20, 468))
+
+        return surf
 
     def render_previous(self):
         return True
@@ -6,6 +6,7 @@ from appdirs import user_data_dir
 from pygame.event import Event, post
 
 import scenes.title
+from assets import ASSETS
 from button import ButtonComponent, render_all_buttons
 from game_events import (
     EQUIP_BUY_CLOUD_SLEEVES,
@@ -15,6 +16,7 @@ from game_events import (
     EQUIP_QUIT,
     EQUIP_SAVE_AND_START,
     LOAD,
+    SoundEvent,
 )
 from scene import Scene, SceneManager
 from utils import APP_AUTHOR, APP_NAME, find_data_file
@@ -51,6 +53,14 @@ class EquipScene(Scene):
             + settings["extraFuelCost"] * player_entity.player.extraFuel // 2
         )
 
+        self.backdrop = self._draw_backdrop(world, context["screen"].get_size())
+        self.backdrop_changed = True
+        self.icarus_image = pygame.transform.scale(
+            ASSETS.image("resources/icarus_body.png"), (288, 200)
+        )
+        # Where Icarus was last drawn
+        self.icarus_rect = None
+
         # menu setup
         men = []
         men.append(("Quit", lambda: post(Event(EQUIP_QUIT))))
@@ -164,13 +174,7 @@ class EquipScene(Scene):
 
         for event in events:
             if event.type == EQUIP_QUIT:
-                world.inject_event(
-                    {
-                        "type": "sound",
-                        "action": "stop",
-                        "sound": "shop_music",
-                    }
-                )
+                world.inject_event(SoundEvent.shared("stop", "shop_music"))
                 return SceneManager.new_root(scenes.title.TitleScene())
             if event.type == EQUIP_BUY_CLOUD_SLEEVES:
                 self._shop(settings["cloudSleevesCost"], "cloud_sleeves", world)
@@ -189,13 +193,7 @@ class EquipScene(Scene):
                 self.teardown(world)
                 self.setup(world)
             if event.type == EQUIP_SAVE_AND_START:
-                world.inject_event(
-                    {
-                        "type": "sound",
-                        "action": "stop",
-                        "sound": "shop_music",
-                    }
-                )
+                world.inject_event(SoundEvent.shared("stop", "shop_music"))
                 self._save(settings["save_file"], world)
                 self.teardown(world)
                 post(Event(LOAD))
@@ -204,24 +202,50 @@ class EquipScene(Scene):
         world.process_all_systems(events)
 
         # start music
-        world.inject_event(
-            {
-                "type": "sound",
-                "action": "start",
-                "sound": "shop_music",
-            }
-        )
+        world.inject_event(SoundEvent.shared("start", "shop_music"))
 
     def render(self, world):
         context = world.find_component("context")
-        settings = world.find_component("settings")
         screen = context["screen"]
 
+        # Everything but Icarus and the buttons only changes when something is bought, which sets the scene up again
+        screen.blit(self.backdrop, (0, 0))
+
+        # Icarus himself
+        sprite = pygame.sprite.Sprite()
+        sprite.image = self.icarus_image
+        sprite.rect = sprite.image.get_rect()
+        sprite.rect.centerx = screen.get_width() // 2
+        sprite.rect.centery = screen.get_height() // 2 - 200 + self.icarus_offset
+        screen.blit(sprite.image, sprite.rect)
+
+        # Display the buttons
+        dirty_rects = render_all_buttons(screen, world)
+
+        # Bob once per simulation step, so the animation speed doesn't depend on the frame rate
+        for _ in range(context["steps"]):
+            self.icarus_offset = self.icarus_offset + self.icarus_offset_increment
+
+            if abs(self.icarus_offset) > 10:
+                self.icarus_offset_increment = self.icarus_offset_increment * -1
+
+        # Redraw everything if the backdrop is new, otherwise only Icarus and the buttons might have moved
+        icarus_rect = self.icarus_rect
+        self.icarus_rect = sprite.rect
+        if self.backdrop_changed:
+            self.backdrop_changed = False
+            return None
+        return dirty_rects + [icarus_rect, sprite.rect]
+
+    # Draws the background and all of the text, which depends on what the player has bought
+    def _draw_backdrop(self, world, size):
+        settings = world.find_component("settings")
         player_entity = world.find_entity("player")
+        backdrop = pygame.Surface(size)
 
         # Draw a nice background
-        screen.blit(pygame.image.load(find_data_file("resources/bg_sky.png")), (0, 0))
-        screen.blit(pygame.image.load(find_data_file("resources/bg_sky.png")), (0, 500))
+        backdrop.blit(ASSETS.image("resources/bg_sky.png"), (0, 0))
+        backdrop.blit(ASSETS.image("resources/bg_sky.png"), (0, 500))
 
         # text
         text = self.font.render(
@@ -229,16 +253,16 @@ class EquipScene(Scene):
             True,
             (245, 245, 245),
         )
-        screen.blit(text, (50, 50))
+        backdrop.blit(text, (50, 50))
 
         text = self.big_font.render("Legs:", True, (245, 245, 245))
-        screen.blit(text, (120, 480 - 200))
+        backdrop.blit(text, (120, 480 - 200))
         pygame.draw.line(
-            screen, (245, 245, 245), (120, 531 - 200), (223, 531 - 200), width=8
+            backdrop, (245, 245, 245), (120, 531 - 200), (223, 531 - 200), width=8
         )
 
         text = self.font.render("Jet Booster", True, (245, 245, 245))
-        screen.blit(text, (180, 550 - 200))
+        backdrop.blit(text, (180, 550 - 200))
         if player_entity.player.hasJetBoots == 1:
             text = self.font.render("Owned", True, (245, 245, 245))
         else:
@@ -250,14 +274,14 @@ class EquipScene(Scene):
             text = self.font.render(
                 f"Cost: ${settings['jetBootsCost']}", True, text_color
             )
-        screen.blit(text, (180, 582 - 200))
+        backdrop.blit(text, (180, 582 - 200))
         text = self.small_font.render(
             "Press space to give yourself a boost!", True, (230, 200, 85)
         )
-        screen.blit(text, (120, 614 - 200))
+        backdrop.blit(text, (120, 614 - 200))
 
         text = self.font.render("More Fuel", True, (245, 245, 245))
-        screen.blit(text, (180, 650 - 200))
+        backdrop.blit(text, (180, 650 - 200))
         if player_entity.player.extraFuel == 9:
             text = self.font.render("Maxed Out", True, (245, 245, 245))
         else:
@@ -267,27 +291,27 @@ class EquipScene(Scene):
                 else (170, 200, 200)
             )
             text = self.font.render(f"Cost: ${self.extra_fuel_cost}", True, text_color)
-        screen.blit(text, (180, 682 - 200))
+        backdrop.blit(text, (180, 682 - 200))
         text = self.small_font.render(
             "More fuel means more boosting!", True, (230, 200, 85)
         )
-        screen.blit(text, (120, 714 - 200))
+        backdrop.blit(text, (120, 714 - 200))
         if player_entity.player.hasJetBoots > 0:
             text = self.small_font.render(
                 f"Total boosts: {player_entity.player.extraFuel + 1}{'! Wow!' if player_entity.player.extraFuel == 9 else ''}",
                 True,
                 (220, 40, 10),
             )
-            screen.blit(text, (120, 744 - 200))
+            backdrop.blit(text, (120, 744 - 200))
 
         text = self.big_font.render("Arms:", True, (245, 245, 245))
-        screen.blit(text, (640, 480 - 200))
+        backdrop.blit(text, (640, 480 - 200))
         pygame.draw.line(
-            screen, (245, 245, 245), (640, 531 - 200), (763, 531 - 200), width=8
+            backdrop, (245, 245, 245), (640, 531 - 200), (763, 531 - 200), width=8
         )
 
         text = self.font.render("Cloud Sleeves", True, (245, 245, 245))
-        screen.blit(text, (700, 550 - 200))
+        backdrop.blit(text, (700, 550 - 200))
         if player_entity.player.hasCloudSleeves == 1:
             text = self.font.render("Owned", True, (245, 245, 245))
         else:
@@ -299,14 +323,14 @@ class EquipScene(Scene):
             text = self.font.render(
                 f"Cost: ${settings['cloudSleevesCost']}", True, text_color
             )
-        screen.blit(text, (700, 582 - 200))
+        backdrop.blit(text, (700, 582 - 200))
         text = self.small_font.render(
             "Don't let gravity get you down!", True, (230, 200, 85)
         )
-        screen.blit(text, (640, 614 - 200))
+        backdrop.blit(text, (640, 614 - 200))
 
         text = self.font.render("Bird Wings", True, (245, 245, 245))
-        screen.blit(text, (700, 650 - 200))
+        backdrop.blit(text, (700, 650 - 200))
         if player_entity.player.hasWings == 1:
             text = self.font.render("Owned", True, (245, 245, 245))
         else:
@@ -316,39 +340,21 @@ class EquipScene(Scene):
                 else (170, 200, 200)
             )
             text = self.font.render(f"Cost: ${settings['wingsCost']}", True, text_color)
-        screen.blit(text, (700, 682 - 200))
+        backdrop.blit(text, (700, 682 - 200))
         text = self.small_font.render(
             "Make tighter turns! Y'know, like a bird. Just go with it.",
             True,
             (230, 200, 85),
         )
-        screen.blit(text, (640, 714 - 200))
+        backdrop.blit(text, (640, 714 - 200))
         text = self.small_font.render(
             "If you want to pretend you don't have wings, hold shift.",
             True,
             (230, 200, 85),
         )
-        screen.blit(text, (640, 744 - 200))
-
-        # Icarus himself
-        sprite = pygame.sprite.Sprite()
-        sprite.image = pygame.image.load(find_data_file("resources/icarus_body.png"))
-        sprite.image = pygame.transform.scale(sprite.image, (288, 200))
-        sprite.rect = sprite.image.get_rect()
-        sprite.rect.centerx = screen.get_width() // 2
-        sprite.rect.centery = screen.get_height() // 2 - 200 + self.icarus_offset
-        screen.blit(sprite.image, sprite.rect)
-
-        # Display the buttons
-        render_all_buttons(screen, world)
-
-        # Flip display to render lines
-        pygame.display.flip()
-
-        self.icarus_offset = self.icarus_offset + self.icarus_offset_increment
+        backdrop.blit(text, (640, 744 - 200))
 
-        if abs(self.icarus_offset) > 10:
-            self.icarus_offset_increment = self.icarus_offset_increment * -1
+        return backdrop
 
     def _save(self, save_file, world):
         if not os.path.exists(user_data_dir(APP_NAME, APP_AUTHOR)):
@@ -1,20 +1,34 @@
 import json
 import math
 import random
+from collections import namedtuple
 from os import path
 
+import numpy as np
 import pygame
 from appdirs import user_data_dir
 from pygame.sprite import Sprite
 
+from assets import ASSETS, ROTATIONS
+from background import BackgroundComponent, render_background
 from common_components import PlayerComponent
-from ecs import Component, System
-from game_events import LOAD, SCENE_REFOCUS, VICTORY
+from ecs import ColumnarComponent, Component, SpatialHash, System
+from game_events import (
+    GLIDE,
+    LOAD,
+    MOVE,
+    PHYSICS_FRAME_RESET,
+    SCENE_REFOCUS,
+    VICTORY,
+    PhysicsForceEvent,
+    SoundEvent,
+)
+from render import RenderQueue
 from scene import Scene, SceneManager
 from scenes.crash_results import CrashResultsScene
 from scenes.pause import PauseScene
 from scenes.victory import VictoryScene
-from utils import APP_AUTHOR, APP_NAME, find_data_file
+from utils import APP_AUTHOR, APP_NAME
 
 
 class GraphicComponent(Component):
@@ -27,36 +41,39 @@ class GraphicComponent(Component):
         Component.__init__(self, "graphic", metadata)
 
 
-class PositionComponent(Component):
+class PositionComponent(ColumnarComponent):
     """
     For entities that exist somewhere on the coordinate grid
     (i.e., anything physically in the game world).
+    Stored in columns, so systems can move every entity at once.
     """
 
     def __init__(self, x, y):
         metadata = {"x": x, "y": y}
-        Component.__init__(self, "position", metadata)
+        ColumnarComponent.__init__(self, "position", metadata)
 
 
-class PhysicsComponent(Component):
+class PhysicsComponent(ColumnarComponent):
     """
     For entities with some kind of physics-based movement.
+    Stored in columns, so systems can run physics for every entity at once.
     """
 
     def __init__(self):
         metadata = {"velocity": 0, "angle": 0, "acceleration": 0}
-        Component.__init__(self, "physics", metadata)
+        ColumnarComponent.__init__(self, "physics", metadata)
 
 
-class RotationComponent(Component):
+class RotationComponent(ColumnarComponent):
     """
     For entities that rotate. Affects both graphics and physics.
     Maybe makes more sense as a RotationalVelocityComponent or something, that adds its speed to VelocityComponent's angle?
+    Stored in columns, so systems can read every entity's angle at once.
     """
 
     def __init__(self, angle):
         metadata = {"angle": angle}
-        Component.__init__(self, "rotation", metadata)
+        ColumnarComponent.__init__(self, "rotation", metadata)
 
 
 class GlidingComponent(Component):
@@ -78,6 +95,9 @@ class GravityComponent(Component):
 
 
 class PhysicsFrameResetSystem(System):
+    reads = {"context"}
+    writes = {"physics"}
+
     def __init__(self):
         super().__init__()
         self.subscribe("physics_frame_reset")
@@ -92,9 +112,7 @@ class PhysicsFrameResetSystem(System):
             return
 
         # get entities that need reset
-        physics_entities = set(world.filter("physics"))
-
-        for entity in physics_entities:
+        for entity in world.query("physics"):
 
             # For now, this is the only thing that needs reset.
             # In in the future, we might also reset forces acting on the entity.
@@ -102,6 +120,17 @@ class PhysicsFrameResetSystem(System):
 
 
 class ForceSystem(System):
+    """
+    Applies every force injected this frame to all physics entities.
+    Forces are collected first, then resolved in a single pass over each archetype table's physics columns.
+    Combining forces is order dependent (each one pulls the entity's angle halfway towards its own),
+    so within that pass they're still folded in the order they were injected, giving the same result as
+    applying each force to each entity in turn.
+    """
+
+    reads = {"context"}
+    writes = {"physics"}
+
     def __init__(self):
         super().__init__()
         self.subscribe("physics_force")
@@ -110,35 +139,40 @@ class ForceSystem(System):
         if world.find_component("context")["paused"]:
             return
 
-        events = self.pending()
-        physics_entities = set(world.filter("physics"))
-
-        for event in events:
-            magnitude = event["magnitude"]
-            angle = event["angle"]
+        forces = [
+            (event.magnitude, event.angle)
+            for event in self.pending()
+            if event.magnitude != 0
+        ]
+        if not forces:
+            return
 
-            if magnitude == 0:
+        for table in world.tables("physics"):
+            if not table.entities:
                 continue
 
-            for entity in physics_entities:
-                if entity.physics.velocity == 0:
-                    entity.physics.angle = angle
-                theta = math.radians(angle - entity.physics.angle)
-                current_accel = entity.physics.acceleration
+            velocity = table.column("physics", "velocity")
+            angle = table.column("physics", "angle")
+            acceleration = table.column("physics", "acceleration")
+
+            for magnitude, force_angle in forces:
+                # Entities at rest simply start moving in the direction of the force
+                angle[velocity == 0] = force_angle
+                theta = np.radians(force_angle - angle)
 
-                new_accel = math.sqrt(
+                acceleration[:] = np.sqrt(
                     pow(magnitude, 2)
-                    + pow(current_accel, 2)
-                    + 2 * magnitude * current_accel * math.cos(theta)
+                    + np.square(acceleration)
+                    + 2 * magnitude * acceleration * np.cos(theta)
                 ) * math.copysign(1, magnitude)
-                new_angle = math.degrees(theta / 2)
-
-                entity.physics.acceleration = new_accel
-                entity.physics.angle += new_angle
-                entity.physics.velocity += entity.physics.acceleration
+                angle += np.degrees(theta / 2)
+                velocity += acceleration
 
 
 class MovementSystem(System):
+    reads = {"context", "graphic", "player", "rotation"}
+    writes = {"physics", "position"}
+
     def __init__(self):
         super().__init__()
         self.subscribe("move")
@@ -155,27 +189,31 @@ class MovementSystem(System):
         context = world.find_component("context")
         screen = context["screen"]
 
-        physics_entities = set(world.filter("physics"))
+        # Every physics entity in a table is integrated at once, working directly on the table's columns
+        for table in world.tables("physics", "position", "rotation"):
+            if not table.entities:
+                continue
 
-        for entity in physics_entities:
+            velocity = table.column("physics", "velocity")
+            angle = table.column("physics", "angle")
+            rotation = table.column("rotation", "angle")
+            x = table.column("position", "x")
+            y = table.column("position", "y")
 
-            in_space = calculate_altitude(entity, screen) < -2200
+            in_space = calculate_altitudes(table, screen) < -2200
+            cloud_sleeves = has_cloud_sleeves(table)
 
             min_cross_section = 0.1
             max_cross_section = 0.75
             cross_sectional_area = min_cross_section + (
                 max_cross_section - min_cross_section
-            ) * math.sin(math.radians(entity.rotation.angle - entity.physics.angle))
+            ) * np.sin(np.radians(rotation - angle))
 
             # Drag coefficient helps determine the force of drag, and varies by material
-            drag_coeff = 0.9
-            if entity.player is not None and entity.player.hasCloudSleeves:
-                drag_coeff = 0.3
+            drag_coeff = np.where(cloud_sleeves, 0.3, 0.9)
 
             # The higher you are, the less resistance the atmosphere provides
-            air_density = 1.22
-            if in_space:
-                air_density = 0.9
+            air_density = np.where(in_space, 0.9, 1.22)
 
             # Aerodynamic drag equation
             drag_magnitude = (
@@ -183,33 +221,30 @@ class MovementSystem(System):
                 * drag_coeff
                 * air_density
                 * cross_sectional_area
-                * pow(entity.physics.velocity, 2)
+                * np.square(velocity)
                 / 62  # Entity weight
-            ) * math.copysign(1, entity.physics.velocity)
+            ) * np.copysign(1, velocity)
 
-            radians = math.radians(entity.physics.angle)
+            radians = np.radians(angle)
 
-            drag_magnitude *= abs(math.sin(radians))
-            entity.physics.velocity -= drag_magnitude
-            speed = entity.physics.velocity
+            drag_magnitude *= np.abs(np.sin(radians))
+            velocity -= drag_magnitude
 
-            xx = entity.position.x + math.cos(radians) * speed
-            yy = entity.position.y + math.sin(radians) * speed
+            x += np.cos(radians) * velocity
+            y += np.sin(radians) * velocity
 
             # very simplistic gravity
-            gravity = 8
-            if entity.player is not None and entity.player.hasCloudSleeves:
-                gravity = 4
+            gravity = np.where(cloud_sleeves, 4, 8)
 
-            if in_space:
-                gravity = 1
-            yy += gravity
-
-            entity.position.x = xx
-            entity.position.y = yy
+            gravity[in_space] = 1
+            y += gravity
 
 
 class GlidingSystem(System):
+    reads = {"context", "gliding", "rotation"}
+    writes = set()
+    emits = ("physics_force",)
+
     def __init__(self):
         super().__init__()
         self.subscribe("glide")
@@ -224,7 +259,7 @@ class GlidingSystem(System):
         if not events:
             return
 
-        gliders = world.filter("gliding")
+        gliders = world.query("gliding", "rotation")
 
         # All gliders should have physics and rotation components
         for glider in gliders:
@@ -240,19 +275,7 @@ class GlidingSystem(System):
             if magnitude < 0:
                 magnitude /= 4
 
-            world.inject_event(
-                {"type": "physics_force", "magnitude": magnitude, "angle": angle}
-            )
-
-
-class BackgroundComponent(Component):
-    def __init__(self, image_path, y):
-        metadata = {
-            "image": pygame.image.load(find_data_file(image_path)),
-            "x": 0,
-            "y": y,
-        }
-        Component.__init__(self, "background", metadata)
+            world.inject_event(PhysicsForceEvent(magnitude, angle))
 
 
 class CollectableComponent(Component):
@@ -267,7 +290,7 @@ class PlayerSprite(Sprite):
     def __init__(self, image_path):
         Sprite.__init__(self)
 
-        self.image = pygame.image.load(find_data_file(image_path))
+        self.image = ASSETS.image(image_path)
         self.rect = self.image.get_rect()
 
 
@@ -277,22 +300,62 @@ class CameraComponent(Component):
             "target_entity_id": target_entity_id,
             "x": 0,
             "y": 0,
+            # Where the camera was as of the previous simulation step, for smooth rendering between steps
+            "previous_x": 0,
+            "previous_y": 0,
         }
         Component.__init__(self, "camera", metadata)
 
 
-class CollectableSystem(System):
+class BroadphaseComponent(Component):
+    """
+    Holds the spatial hash every collidable entity is indexed in, so collision checks only look at nearby entities.
+    """
+
+    def __init__(self, cell_size):
+        metadata = {"grid": SpatialHash(cell_size)}
+        Component.__init__(self, "broadphase", metadata)
+
+
+class BroadphaseSystem(System):
+    """
+    Keeps moving entities' sprite rects and broadphase entries in sync with their positions.
+    Entities that never move (like collectables) are indexed once when they spawn.
+    """
+
+    reads = {"physics", "position"}
+    writes = {"broadphase", "graphic"}
+
     def __init__(self):
+        super().__init__()
+
+    def process(self, events, world):
+        grid = world.find_component("broadphase")["grid"]
+
+        for entity in world.query("physics", "position", "graphic"):
+            sprite = entity.graphic.sprite
+            sprite.rect = sprite.image.get_rect(
+                x=entity.position.x, y=entity.position.y
+            )
+            grid.update(entity, sprite.rect)
+
+
+class CollectableSystem(System):
+    reads = {"camera", "context"}
+    writes = {"broadphase", "collectable", "graphic", "player", "position", "rotation"}
+    emits = ("sound",)
+    structural = True
+
+    def __init__(self, screen_width, screen_height):
         self.offscreen_slots = []
         super().__init__()
 
-        screen_info = pygame.display.Info()
         self.x_slot_size = 150
         self.y_slot_size = 75
 
         # Special case where we immediately need collectables on screen for the player to collect
-        num_x_slots = screen_info.current_w // self.x_slot_size
-        num_y_slots = screen_info.current_h // self.y_slot_size
+        num_x_slots = screen_width // self.x_slot_size
+        num_y_slots = screen_height // self.y_slot_size
 
         self.screen_slots = []
         for x_slot in range(num_x_slots):
@@ -301,7 +364,7 @@ class CollectableSystem(System):
 
         # Slots to spawn new collectables off screen
         num_x_slots = 300 // self.x_slot_size
-        num_y_slots = (screen_info.current_h + 200) // self.y_slot_size
+        num_y_slots = (screen_height + 200) // self.y_slot_size
 
         self.offscreen_slots = []
         for x_slot in range(num_x_slots):
@@ -312,39 +375,34 @@ class CollectableSystem(System):
         screen = world.find_component("context")["screen"]
         camera = world.find_component("camera")
         player = world.get(camera["target_entity_id"])
+        grid = world.find_component("broadphase")["grid"]
 
         collectables = world.filter("collectable")
 
-        # Update player's sprite rect so we can use pygame's collision detection
-        player.graphic.sprite.rect = player.graphic.sprite.image.get_rect(
-            x=player.position.x, y=player.position.y
-        )
-
         to_remove = []
 
-        for collectable in collectables:
+        # Only collectables sharing a broadphase cell with the player could possibly be touching them
+        for collectable in grid.query(player.graphic.sprite.rect):
+            if "collectable" not in collectable.archetype.components:
+                continue
             collision = pygame.sprite.collide_rect(
                 player.graphic.sprite, collectable.graphic.sprite
             )
             if collision:
                 player.player.currency += collectable.collectable.worth
-                world.inject_event(
-                    {
-                        "type": "sound",
-                        "action": "play",
-                        "sound": "collect",
-                    }
-                )
+                world.inject_event(SoundEvent.shared("play", "collect"))
                 # If we hit a plane, add a boost back to icarus
                 if collectable.collectable.worth == 300:
                     if player.player.numBoosts < player.player.maxBoosts:
                         player.player.numBoosts += 1
                 to_remove.append(collectable)
 
-        # Remove old collectables that have been scrolled past
-        for collectable in collectables:
-            if collectable.position.x < camera.x - 200:
-                to_remove.append(collectable)
+        # Remove old collectables that have been scrolled past, checking a whole table of positions at a time
+        for table in world.tables("collectable", "position"):
+            scrolled_past = np.flatnonzero(
+                table.column("position", "x") < camera.x - 200
+            )
+            to_remove.extend(table.entities[row] for row in scrolled_past)
 
         # Create new collectables
         current_collectables = len(collectables) - len(to_remove)
@@ -374,7 +432,9 @@ class CollectableSystem(System):
                 # Spawn these new collectables off screen
                 x = camera.x + screen.get_width() + (x_slot * self.x_slot_size)
                 y = camera.y - 100 + (y_slot * self.y_slot_size)
-            spawner(world.gen_entity(), (x, y))
+            collectable = world.gen_entity()
+            spawner(collectable, (x, y))
+            grid.update(collectable, collectable.graphic.sprite.rect)
 
         # Remove all the collectables that are due for cleanup
         world.remove_entities(to_remove)
@@ -386,6 +446,9 @@ class MoonComponent(Component):
 
 
 class MoonSystem(System):
+    reads = {"context", "player"}
+    writes = {"broadphase", "graphic", "moon", "position"}
+
     def __init__(self):
         super().__init__()
 
@@ -396,6 +459,7 @@ class MoonSystem(System):
 
         moon = world.find_entity("moon")
         player = world.find_entity("player")
+        grid = world.find_component("broadphase")["grid"]
 
         moon.position.x = (
             player.position.x + screen.get_width() - 200 - player.position.x / 80
@@ -404,19 +468,23 @@ class MoonSystem(System):
             moon.position.x, player.position.x - moon.graphic.sprite.rect.width / 5
         )
 
-        # Update the moon's rect for proper collision detection
+        # Update the moon's rect and broadphase entry for proper collision detection
         moon.graphic.sprite.rect = moon.graphic.sprite.image.get_rect(
             x=moon.position.x, y=moon.position.y
         )
+        grid.update(moon, moon.graphic.sprite.rect)
 
-        collision = pygame.sprite.collide_rect(
-            player.graphic.sprite, moon.graphic.sprite
-        )
-        if collision:
-            pygame.event.post(pygame.event.Event(VICTORY))
+        for other in grid.query(player.graphic.sprite.rect):
+            if other is moon and pygame.sprite.collide_rect(
+                player.graphic.sprite, moon.graphic.sprite
+            ):
+                pygame.event.post(pygame.event.Event(VICTORY))
 
 
 class CameraSystem(System):
+    reads = {"context", "player", "position"}
+    writes = {"camera"}
+
     def __init__(self):
         super().__init__()
 
@@ -459,6 +527,66 @@ def calculate_altitude(player, screen):
     return player.position.y - 960 + sprite_height
 
 
+# Same as calculate_altitude, but for every entity in an archetype table at once
+def calculate_altitudes(table, screen):
+    sprite_heights = np.fromiter(
+        (entity.graphic.sprite.image.get_height() for entity in table.entities),
+        dtype=float,
+        count=len(table.entities),
+    )
+    # TODO: must come up with a better way to handle this than hardcoding 960, to allow screen resizing
+    return table.column("position", "y") - 960 + sprite_heights
+
+
+# Mask of which entities in an archetype table are wearing cloud sleeves. Only players can own upgrades
+def has_cloud_sleeves(table):
+    if "player" not in table.components:
+        return np.zeros(len(table.entities), dtype=bool)
+    return np.fromiter(
+        (bool(entity.player.hasCloudSleeves) for entity in table.entities),
+        dtype=bool,
+        count=len(table.entities),
+    )
+
+
+# The player's inputs for a single simulation step. Scenes get these from an input source, which is any callable taking
+# the step's events and the world, so flights can be driven by the keyboard or by a script
+Controls = namedtuple(
+    "Controls", ["jump", "rotate_left", "rotate_right", "slow_rotation", "boosts"]
+)
+
+
+# The default input source, which reads the player's controls from the keyboard
+def keyboard_input(events, world):
+    keys = pygame.key.get_pressed()
+    mods = pygame.key.get_mods()
+    boosts = sum(
+        1
+        for event in events
+        if event.type == pygame.KEYDOWN and event.key == pygame.K_SPACE
+    )
+    return Controls(
+        jump=keys[pygame.K_SPACE],
+        rotate_left=keys[pygame.K_LEFT],
+        rotate_right=keys[pygame.K_RIGHT],
+        slow_rotation=bool(mods & pygame.KMOD_SHIFT),
+        boosts=boosts,
+    )
+
+
+# Applies saved upgrades (the same fields as a save file) to the player
+def apply_upgrades(player_entity, upgrades):
+    player_entity.player.currency = upgrades["currency"]
+    player_entity.player.hasCloudSleeves = upgrades["hasCloudSleeves"]
+    player_entity.player.hasWings = upgrades["hasWings"]
+    player_entity.player.hasJetBoots = upgrades["hasJetBoots"]
+    player_entity.player.extraFuel = upgrades["extraFuel"]
+
+    if player_entity.player.hasJetBoots:
+        player_entity.player.maxBoosts = 1 + player_entity.player.extraFuel
+        player_entity.player.numBoosts = player_entity.player.maxBoosts
+
+
 def load(world):
     settings = world.find_component("settings")
     if path.exists(
@@ -469,16 +597,7 @@ def load(world):
             "r",
         ) as f:
             loaded_json = json.load(f)
-            player_entity = world.find_entity("player")
-            player_entity.player.currency = loaded_json["currency"]
-            player_entity.player.hasCloudSleeves = loaded_json["hasCloudSleeves"]
-            player_entity.player.hasWings = loaded_json["hasWings"]
-            player_entity.player.hasJetBoots = loaded_json["hasJetBoots"]
-            player_entity.player.extraFuel = loaded_json["extraFuel"]
-
-            if player_entity.player.hasJetBoots:
-                player_entity.player.maxBoosts = 1 + player_entity.player.extraFuel
-                player_entity.player.numBoosts = player_entity.player.maxBoosts
+            apply_upgrades(world.find_entity("player"), loaded_json)
 
 
 def create_cloud(entity, position):
@@ -486,7 +605,7 @@ def create_cloud(entity, position):
     entity.attach(PositionComponent(position[0], position[1]))
     entity.attach(RotationComponent(0))
     sprite = pygame.sprite.Sprite()
-    sprite.image = pygame.image.load(find_data_file("resources/object_cloud.png"))
+    sprite.image = ASSETS.image("resources/object_cloud.png")
     sprite.rect = sprite.image.get_rect(x=position[0], y=position[1])
     entity.attach(GraphicComponent(sprite))
 
@@ -496,7 +615,7 @@ def create_bird(entity, position):
     entity.attach(PositionComponent(position[0], position[1]))
     entity.attach(RotationComponent(0))
     sprite = pygame.sprite.Sprite()
-    sprite.image = pygame.image.load(find_data_file("resources/object_bird.png"))
+    sprite.image = ASSETS.image("resources/object_bird.png")
     sprite.rect = sprite.image.get_rect(x=position[0], y=position[1])
     entity.attach(GraphicComponent(sprite))
 
@@ -506,21 +625,43 @@ def create_plane(entity, position):
     entity.attach(PositionComponent(position[0], position[1]))
     entity.attach(RotationComponent(0))
     sprite = pygame.sprite.Sprite()
-    sprite.image = pygame.image.load(find_data_file("resources/object_plane.png"))
+    sprite.image = ASSETS.image("resources/object_plane.png")
     sprite.rect = sprite.image.get_rect(x=position[0], y=position[1])
     entity.attach(GraphicComponent(sprite))
 
 
+# Layers the game is drawn in, from the back
+BACKGROUND_LAYER = 0
+SPRITE_LAYER = 1
+HUD_LAYER = 2
+
+
 class GameScene(Scene):
-    def __init__(self):
-        self.font = pygame.font.Font(
-            find_data_file("resources/dpcomic-font/DpcomicRegular-p3jD.ttf"), 36
+    # How far past the edges of the screen to look for entities to draw. Covers sprites growing as they rotate,
+    # and moving part of a step between where the broadphase last saw them and where they're drawn
+    CULL_MARGIN = 100
+
+    def __init__(self, input_source=keyboard_input, stats_hook=None):
+        self.input_source = input_source
+        # Called after every frame with a dict of how many graphical entities were "drawn", and how many were "culled"
+        # for being off screen
+        self.stats_hook = stats_hook
+        self.font = ASSETS.font("resources/dpcomic-font/DpcomicRegular-p3jD.ttf", 36)
+        # The currency counter changes all the time, so draw it from pre-rendered characters
+        self.currency_glyphs = ASSETS.glyphs(
+            "resources/dpcomic-font/DpcomicRegular-p3jD.ttf",
+            36,
+            (245, 245, 245),
+            charset="$0123456789-",
         )
 
     def setup(self, world):
         context = world.find_component("context")
         screen = context["screen"]
 
+        # Everything but the boost meter is drawn through here, in one go at the end of the frame
+        self.render_queue = RenderQueue(screen)
+
         # Create a sprite for the title
         self.help_message = pygame.sprite.Sprite()
         self.help_message.image = self.font.render(
@@ -542,36 +683,52 @@ class GameScene(Scene):
         player_entity.attach(GlidingComponent())
         player_entity.attach(GravityComponent())
 
-        # Scrolling background - layers defined by the y coord
-        world.gen_entity().attach(BackgroundComponent("resources/bg_space.png", -2540))
-        world.gen_entity().attach(BackgroundComponent("resources/bg_space.png", -2040))
-        world.gen_entity().attach(
-            BackgroundComponent("resources/bg_sky-space.png", -1540)
-        )
-        world.gen_entity().attach(BackgroundComponent("resources/bg_sky.png", -1040))
-        world.gen_entity().attach(BackgroundComponent("resources/bg_sky.png", -540))
-        world.gen_entity().attach(BackgroundComponent("resources/bg_sky.png", -40))
-        world.gen_entity().attach(
-            BackgroundComponent("resources/bg_cityscape.png", 460)
+        # Scrolling background - layers from the top of space down to the city, starting at this y coord
+        background_entity = world.gen_entity()
+        background_entity.attach(
+            BackgroundComponent(
+                [
+                    "resources/bg_tile_space.png",
+                    "resources/bg_tile_space.png",
+                    "resources/bg_tile_sky-space.png",
+                    "resources/bg_tile_sky.png",
+                    "resources/bg_tile_sky.png",
+                    "resources/bg_tile_sky.png",
+                    "resources/bg_tile_cityscape.png",
+                ],
+                -2540,
+            )
         )
 
         # Create the camera
         camera_entity = world.gen_entity()
         camera_entity.attach(CameraComponent(player_entity.id))
 
+        # Index for collision checks. Cells are the size of a collectable spawn slot
+        broadphase_entity = world.gen_entity()
+        broadphase_entity.attach(BroadphaseComponent(150))
+        grid = broadphase_entity.broadphase.grid
+        world.register_index(grid)
+
+        # Index the player straight away, so they're drawn even before the first simulation step
+        player_sprite = player_entity.graphic.sprite
+        player_sprite.rect = player_sprite.image.get_rect(
+            x=player_entity.position.x, y=player_entity.position.y
+        )
+        grid.update(player_entity, player_sprite.rect)
+
         # Spawn the moon
         moon_entity = world.gen_entity()
         moon_entity.attach(PositionComponent(screen.get_width() - 100, -2500))
         moon_entity.attach(RotationComponent(0))
         moon_sprite = pygame.sprite.Sprite()
-        moon_sprite.image = pygame.image.load(
-            find_data_file("resources/object_moon.png")
+        moon_sprite.image = ASSETS.image("resources/object_moon.png")
+        moon_sprite.rect = moon_sprite.image.get_rect(
+            x=moon_entity.position.x, y=moon_entity.position.y
         )
-        moon_sprite.image.get_rect().x = moon_entity.position.x
-        moon_sprite.image.get_rect().y = moon_entity.position.y
-        moon_sprite.rect = moon_sprite.image.get_rect()
         moon_entity.attach(GraphicComponent(moon_sprite))
         moon_entity.attach(MoonComponent())
+        grid.update(moon_entity, moon_sprite.rect)
 
         # System registration
         self.systems = [
@@ -580,7 +737,8 @@ class GameScene(Scene):
             MovementSystem(),
             GlidingSystem(),
             CameraSystem(),
-            CollectableSystem(),
+            BroadphaseSystem(),
+            CollectableSystem(screen.get_width(), screen.get_height()),
             MoonSystem(),
         ]
         for sys in self.systems:
@@ -611,72 +769,57 @@ class GameScene(Scene):
         if player_entity.player.has_jumped:
 
             # First, clear out per-frame physics values
-            world.inject_event({"type": "physics_frame_reset"})
+            world.inject_event(PHYSICS_FRAME_RESET)
 
             # TODO: Simulate gravity as a force, instead of just doing it in the movement system
-            # world.inject_event({"type": "physics_force", "magnitude": 0, "angle": 90})
+            # world.inject_event(PhysicsForceEvent(0, 90))
 
             # Then gliding, which translates rotation into acceleration
-            world.inject_event({"type": "glide"})
+            world.inject_event(GLIDE)
 
             # Finally, we add movement after any events that could affect acceleration
-            world.inject_event({"type": "move"})
+            world.inject_event(MOVE)
 
             if calculate_altitude(player_entity, screen) > 0:
 
                 # allow the deafening silence to emphasize the player's deadly mistake
-                world.inject_event(
-                    {
-                        "type": "sound",
-                        "action": "stop",
-                        "sound": "background_music",
-                    }
-                )
+                world.inject_event(SoundEvent.shared("stop", "background_music"))
 
                 # also make a funny sound effect
-                world.inject_event(
-                    {
-                        "type": "sound",
-                        "action": "play",
-                        "sound": "crash",
-                    }
-                )
+                world.inject_event(SoundEvent.shared("play", "crash"))
 
                 for sys in self.systems:
                     world.unregister_system(sys)
                 return SceneManager.push(CrashResultsScene())
 
+        # Remember where everything was before this step, so rendering can blend between steps
+        world.save_previous("position")
+        camera = world.find_component("camera")
+        camera.previous_x = camera.x
+        camera.previous_y = camera.y
+
         world.process_all_systems(events)
 
-        keys = pygame.key.get_pressed()
-        mods = pygame.key.get_mods()
+        controls = self.input_source(events, world)
 
         # # Win button for debugging
-        # if keys[pygame.K_v]:
+        # if pygame.key.get_pressed()[pygame.K_v]:
         #     pygame.event.post(pygame.event.Event(VICTORY))
 
         # Before doing anything else, the player must jump off the cliff
         if not player_entity.player.has_jumped:
 
-            if keys[pygame.K_SPACE] and not player_entity.player.jumping:
+            if controls.jump and not player_entity.player.jumping:
 
                 # Tell everyone we've jumped
                 player_entity.player.has_jumped = True
                 player_entity.player.jumping = True
 
                 # The jump itself
-                world.inject_event(
-                    {"type": "physics_force", "magnitude": 20, "angle": -20}
-                )
+                world.inject_event(PhysicsForceEvent.shared(20, -20))
 
                 # Start background music
-                world.inject_event(
-                    {
-                        "type": "sound",
-                        "action": "start",
-                        "sound": "background_music",
-                    }
-                )
+                world.inject_event(SoundEvent.shared("start", "background_music"))
 
         # We don't want to rotate before jumping. TODO: or do we?
         else:
@@ -688,37 +831,31 @@ class GameScene(Scene):
 
             rotation_speed = 1
             # If you have the wings upgrade, you can use shift to go back to slower rotation
-            if player_entity.player.hasWings and not mods & pygame.KMOD_SHIFT:
+            if player_entity.player.hasWings and not controls.slow_rotation:
                 rotation_speed = 2
 
             # The player only has direct control over their angle from the ground.
             # Our rudimentary physics takes care of the rest.
             # Also, clamp the angle from straight up to straight down.
-            if keys[pygame.K_RIGHT]:
+            if controls.rotate_right:
                 player_entity.player.jumping = False
                 angle = player_entity.rotation.angle + rotation_speed
                 player_entity.rotation.angle = min(angle, 90)
-            if keys[pygame.K_LEFT]:
+            if controls.rotate_left:
                 player_entity.player.jumping = False
                 angle = player_entity.rotation.angle - rotation_speed
                 player_entity.rotation.angle = max(angle, -90)
 
-            for event in events:
+            for _ in range(controls.boosts):
                 if (
-                    event.type == pygame.KEYDOWN
-                    and event.key == pygame.K_SPACE
-                    and player_entity.player.has_jumped
+                    player_entity.player.has_jumped
                     and player_entity.player.hasJetBoots
                     and player_entity.player.numBoosts > 0
                 ):
                     player_entity.player.jumping = False
                     player_entity.player.numBoosts -= 1
                     world.inject_event(
-                        {
-                            "type": "physics_force",
-                            "magnitude": 15,
-                            "angle": player_entity.rotation.angle,
-                        }
+                        PhysicsForceEvent(15, player_entity.rotation.angle)
                     )
 
         for event in events:
@@ -733,34 +870,67 @@ class GameScene(Scene):
     def render(self, world):
         context = world.find_component("context")
         screen = context["screen"]
-        background = context["background"]
 
-        graphical_entities = world.filter("graphic")
         player_entity = world.find_entity("player")
         camera = world.find_component("camera")
 
+        # Draw everything part way between the last two simulation steps, depending on how far we are
+        # between steps. If the game is frozen under another scene, just draw where everything is now
+        alpha = 1.0 if context["paused"] else context["interpolation"]
+        camera_x = camera.previous_x + (camera.x - camera.previous_x) * alpha
+        camera_y = camera.previous_y + (camera.y - camera.previous_y) * alpha
+
+        queue = self.render_queue
+
         # City background
-        backgrounds = world.filter("background")
-        for background in backgrounds:
-            background = background.background
-            x = background.x - camera.x
-            if x < -500:
-                # TODO: does an offset help?
-                background.x = camera.x  # - (x + 500)
-            if x > 0:
-                # TODO: does an offset help?
-                background.x = camera.x - 500  # + x
-            y = background.y - camera.y
-            screen.blit(background.image, (x, y))
+        render_background(queue, world, camera_x, camera_y)
+
+        # Only look at entities the broadphase has near the screen, in the same order world.filter("graphic") has them
+        viewport = screen.get_rect()
+        nearby = viewport.move(camera_x, camera_y).inflate(
+            self.CULL_MARGIN * 2, self.CULL_MARGIN * 2
+        )
+        grid = world.find_component("broadphase")["grid"]
+        order = world.cindex["graphic"].positions
+        graphical_entities = [
+            entity for entity in grid.query(nearby) if entity.id in order
+        ]
+        graphical_entities.sort(key=lambda entity: order[entity.id])
+        drawn = 0
+
+        # Interpolated positions, worked out a whole table at a time
+        positions = {}
 
         for entity in graphical_entities:
             # We're assuming all graphical entities also have a position and rotation.
             # TODO: Is there a better way to do this? Will there ever be a graphical entity WITHOUT a position/rotation?
+            table = entity.archetype
+            if table not in positions:
+                positions[table] = (
+                    table.interpolate("position", "x", alpha),
+                    table.interpolate("position", "y", alpha),
+                )
+            xs, ys = positions[table]
+
             image = entity.graphic.sprite.image
-            rotated_image = pygame.transform.rotate(image, entity.rotation.angle * -1)
-            adjusted_x = entity.position.x - camera.x
-            adjusted_y = entity.position.y - camera.y
-            screen.blit(rotated_image, (adjusted_x, adjusted_y))
+            rotated_image = ROTATIONS.rotate(image, entity.rotation.angle * -1)
+            adjusted_x = xs[entity.row] - camera_x
+            adjusted_y = ys[entity.row] - camera_y
+            # Rotating grows the image to fit, so keep it centered where the unrotated image would be
+            rotated_rect = rotated_image.get_rect(
+                center=(
+                    adjusted_x + image.get_width() / 2,
+                    adjusted_y + image.get_height() / 2,
+                )
+            )
+            if rotated_rect.colliderect(viewport):
+                queue.submit(rotated_image, rotated_rect, SPRITE_LAYER)
+                drawn += 1
+
+        if self.stats_hook is not None:
+            self.stats_hook(
+                {"drawn": drawn, "culled": len(world.filter("graphic")) - drawn}
+            )
 
         # # text
         # text = self.font.render(
@@ -799,15 +969,29 @@ class GameScene(Scene):
         # text = self.font.render(f"altitude: {altitude}", True, (10, 10, 10))
         # screen.blit(text, (10, 450))
 
-        text = self.font.render(
-            f"${player_entity.player.currency}", True, (245, 245, 245)
+        queue.blits(
+            self.currency_glyphs.blit_sequence(
+                f"${player_entity.player.currency}", (50, 50)
+            ),
+            layer=HUD_LAYER,
         )
-        screen.blit(text, (50, 50))
+
+        if not player_entity.player.has_jumped:
+            queue.submit(self.help_message.image, self.help_message.rect, HUD_LAYER)
 
         if player_entity.player.maxBoosts > 0:
-            text = self.font.render("Boosts: ", True, (245, 245, 245))
-            screen.blit(text, (50, 85))
+            text = ASSETS.text(
+                "resources/dpcomic-font/DpcomicRegular-p3jD.ttf",
+                36,
+                "Boosts: ",
+                (245, 245, 245),
+            )
+            queue.submit(text, (50, 85), HUD_LAYER)
+
+        queue.flush()
 
+        # The boost meter is drawn straight onto the screen, over everything else
+        if player_entity.player.maxBoosts > 0:
             for i in range(player_entity.player.numBoosts):
                 pygame.draw.circle(screen, (220, 40, 10), (160 + i * 25, 102), 10)
             for i in range(
@@ -815,8 +999,11 @@ class GameScene(Scene):
             ):
                 pygame.draw.circle(screen, (128, 128, 128), (160 + i * 25, 102), 10, 3)
 
-        if not player_entity.player.has_jumped:
-            screen.blit(self.help_message.image, self.help_message.rect)
+        # Nothing moves while paused, otherwise everything does (even if another scene is drawn on top)
+        self.dirty = not context["paused"]
+        if context["paused"]:
+            return []
+        return None
 
     def render_previous(self):
         return False
@@ -827,8 +1014,14 @@ class GameScene(Scene):
             world.find_entity("player"),
             world.find_entity("camera"),
             world.find_entity("moon"),
+            world.find_entity("broadphase"),
+            world.find_entity("background"),
         ]
 
+        broadphase_entity = world.find_entity("broadphase")
+        if broadphase_entity is not None:
+            world.unregister_index(broadphase_entity.broadphase.grid)
+
         world.remove_entities(
             [entity for entity in entities_to_remove if entity is not None]
         )
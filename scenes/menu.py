@@ -4,12 +4,21 @@ import pygame
 from appdirs import user_data_dir
 from pygame.event import Event, post
 
+import scenes.game
 from button import ButtonComponent, render_all_buttons
-from game_events import CONTINUE, CONTROLS, CREDITS, LOAD, NEW_GAME, QUIT, SCENE_REFOCUS
+from game_events import (
+    CONTINUE,
+    CONTROLS,
+    CREDITS,
+    LOAD,
+    NEW_GAME,
+    QUIT,
+    SCENE_REFOCUS,
+    SoundEvent,
+)
 from scene import Scene, SceneManager
 from scenes.controls import ControlsScene
 from scenes.credits import CreditsScene
-from scenes.game import GameScene
 from utils import APP_AUTHOR, APP_NAME
 
 
@@ -59,11 +68,11 @@ class MenuScene(Scene):
                 self._transition_back_to(events, world)
             if event.type == NEW_GAME:
                 self.teardown(world)
-                return SceneManager.new_root(GameScene())
+                return SceneManager.new_root(scenes.game.GameScene())
             if event.type == CONTINUE:
                 self.teardown(world)
                 post(Event(LOAD))
-                return SceneManager.new_root(GameScene())
+                return SceneManager.new_root(scenes.game.GameScene())
             if event.type == CONTROLS:
                 self._transition_away_from(events, world)
                 return SceneManager.push(ControlsScene())
@@ -96,20 +105,14 @@ class MenuScene(Scene):
         screen = context["screen"]
 
         # Display the buttons
-        render_all_buttons(screen, world)
+        return render_all_buttons(screen, world)
 
     def render_previous(self):
         return True
 
     def teardown(self, world):
 
-        world.inject_event(
-            {
-                "type": "sound",
-                "action": "stop",
-                "sound": "title_music",
-            }
-        )
+        world.inject_event(SoundEvent.shared("stop", "title_music"))
 
         buttons = world.filter("button")
 
@@ -7,7 +7,12 @@ from pygame.event import Event, post
 
 import scenes.title
 from button import ButtonComponent, render_all_buttons
-from game_events import PAUSE_CONTINUE, PAUSE_QUIT_TO_MENU, PAUSE_SAVE_AND_QUIT
+from game_events import (
+    PAUSE_CONTINUE,
+    PAUSE_QUIT_TO_MENU,
+    PAUSE_SAVE_AND_QUIT,
+    SoundEvent,
+)
 from scene import Scene, SceneManager
 from utils import APP_AUTHOR, APP_NAME, find_data_file
 
@@ -21,6 +26,11 @@ class PauseScene(Scene):
     def setup(self, world):
         context = world.find_component("context")
         background = context["background"]
+        screen = context["screen"]
+
+        # Darken whatever is behind us. It never changes, so only make it once
+        self.overlay = pygame.Surface(screen.get_size(), pygame.SRCALPHA)
+        self.overlay.fill((0, 0, 0, 175))
 
         # Create a sprite for the header
         self.pause = pygame.sprite.Sprite()
@@ -77,13 +87,7 @@ class PauseScene(Scene):
                 exiting = True
 
         if exiting:
-            world.inject_event(
-                {
-                    "type": "sound",
-                    "action": "stop",
-                    "sound": "background_music",
-                }
-            )
+            world.inject_event(SoundEvent.shared("stop", "background_music"))
             return SceneManager.new_root(scenes.title.TitleScene())
 
         world.process_all_systems(events)
@@ -94,17 +98,13 @@ class PauseScene(Scene):
         screen = context["screen"]
 
         # Blit the text to the screen over top of the background surface
-        overlay = pygame.Surface(
-            (screen.get_width(), screen.get_height()), pygame.SRCALPHA
-        )
-        overlay.fill((0, 0, 0, 175))
-        screen.blit(overlay, overlay.get_rect())
+        screen.blit(self.overlay, (0, 0))
 
         # Render the static pause screen elements
         self.pause_screen.draw(screen)
 
         # Display the buttons
-        render_all_buttons(screen, world)
+        return render_all_buttons(screen, world)
 
     def _save(self, save_file, world):
         if not os.path.exists(user_data_dir(APP_NAME, APP_AUTHOR)):
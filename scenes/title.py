@@ -1,6 +1,7 @@
 import pygame
 
-from game_events import SCENE_REFOCUS
+from assets import ASSETS
+from game_events import SCENE_REFOCUS, SoundEvent
 from scene import Scene, SceneManager
 from scenes.menu import MenuScene
 from utils import find_data_file
@@ -55,16 +56,25 @@ class TitleScene(Scene):
         self.title_screen = pygame.sprite.Group()
         self.title_screen.add(self.title, self.subtitle, self.push_anything)
 
+        # Draw everything behind Icarus which never moves just once
+        screen = context["screen"]
+        self.backdrop = pygame.Surface(screen.get_size())
+        self.backdrop.blit(ASSETS.image("resources/bg_sky-space.png"), (0, 0))
+        self.backdrop.blit(ASSETS.image("resources/bg_cityscape.png"), (0, 500))
+
+        # Moon's hot
+        moon = ASSETS.image("resources/object_moon.png")
+        self.backdrop.blit(moon, moon.get_rect(centerx=screen.get_width(), centery=20))
+
+        # Where Icarus was last drawn
+        self.icarus_rect = None
+        # Whether the text has changed since it was last drawn
+        self.text_changed = False
+
     def update(self, events, world):
 
         # Start music loop
-        world.inject_event(
-            {
-                "type": "sound",
-                "action": "start",
-                "sound": "title_music",
-            }
-        )
+        world.inject_event(SoundEvent.shared("start", "title_music"))
 
         # Run all the systems registered in the world
         world.process_all_systems(events)
@@ -80,10 +90,12 @@ class TitleScene(Scene):
     # This helps us hide things we want when we push a new scene
     def _transition_away_from(self, events, world):
         self.title_screen.remove(self.push_anything)
+        self.text_changed = True
 
     # This helps us get everything back in the right spot when we transition back to our scene
     def _transition_back_to(self, events, world):
         self.title_screen.add(self.push_anything)
+        self.text_changed = True
 
     def render(self, world):
         context = world.find_component("context")
@@ -91,36 +103,39 @@ class TitleScene(Scene):
         screen = context["screen"]
 
         # Draw a nice background
-        screen.blit(
-            pygame.image.load(find_data_file("resources/bg_sky-space.png")), (0, 0)
-        )
-        screen.blit(
-            pygame.image.load(find_data_file("resources/bg_cityscape.png")), (0, 500)
-        )
+        screen.blit(self.backdrop, (0, 0))
 
         # Icarus himself
         sprite = pygame.sprite.Sprite()
-        sprite.image = pygame.image.load(find_data_file("resources/icarus_body.png"))
+        sprite.image = ASSETS.image("resources/icarus_body.png")
         sprite.rect = sprite.image.get_rect()
         sprite.rect.centerx = 180
         sprite.rect.centery = screen.get_height() // 2 + 190 + (self.icarus_offset // 3)
         screen.blit(sprite.image, sprite.rect)
 
-        # Moon's hot
-        sprite = pygame.sprite.Sprite()
-        sprite.image = pygame.image.load(find_data_file("resources/object_moon.png"))
-        sprite.rect = sprite.image.get_rect()
-        sprite.rect.centerx = screen.get_width()
-        sprite.rect.centery = 20
-        screen.blit(sprite.image, sprite.rect)
-
         # Blit the text to the screen over top of the background surface
         self.title_screen.draw(screen)
 
-        self.icarus_offset = self.icarus_offset + self.icarus_offset_increment
+        # Icarus is the only thing that moves, and he keeps bobbing even when the menu is on top
+        dirty_rects = [sprite.rect]
+        if self.icarus_rect is not None:
+            dirty_rects.append(self.icarus_rect)
+        self.icarus_rect = sprite.rect
+        self.dirty = True
+
+        # The prompt comes and goes as other scenes are pushed on top, which can be a frame or more after the switch
+        if self.text_changed:
+            self.text_changed = False
+            dirty_rects.append(self.push_anything.rect)
+
+        # Bob once per simulation step, so the animation speed doesn't depend on the frame rate
+        for _ in range(context["steps"]):
+            self.icarus_offset = self.icarus_offset + self.icarus_offset_increment
+
+            if abs(self.icarus_offset) > 10:
+                self.icarus_offset_increment = self.icarus_offset_increment * -1
 
-        if abs(self.icarus_offset) > 10:
-            self.icarus_offset_increment = self.icarus_offset_increment * -1
+        return dirty_rects
 
     def render_previous(self):
         return False
@@ -4,8 +4,9 @@ import pygame
 from pygame.event import Event, post
 
 import scenes.title
+from assets import ASSETS
 from button import ButtonComponent, render_all_buttons
-from game_events import PAUSE_QUIT_TO_MENU
+from game_events import PAUSE_QUIT_TO_MENU, SoundEvent
 from scene import Scene, SceneManager
 from utils import find_data_file
 
@@ -74,13 +75,7 @@ class VictoryScene(Scene):
         for event in events:
 
             if event.type == PAUSE_QUIT_TO_MENU:
-                world.inject_event(
-                    {
-                        "type": "sound",
-                        "action": "stop",
-                        "sound": "background_music",
-                    }
-                )
+                world.inject_event(SoundEvent.shared("stop", "background_music"))
                 return SceneManager.new_root(scenes.title.TitleScene())
 
     def render(self, world):
@@ -88,16 +83,12 @@ class VictoryScene(Scene):
         screen = context["screen"]
 
         # Draw a nice background
-        screen.blit(pygame.image.load(find_data_file("resources/bg_space.png")), (0, 0))
-        screen.blit(
-            pygame.image.load(find_data_file("resources/bg_space.png")), (0, 500)
-        )
+        screen.blit(ASSETS.image("resources/bg_space.png"), (0, 0))
+        screen.blit(ASSETS.image("resources/bg_space.png"), (0, 500))
 
         # Moon's hot
         moon_sprite = pygame.sprite.Sprite()
-        moon_sprite.image = pygame.image.load(
-            find_data_file("resources/object_moon.png")
-        )
+        moon_sprite.image = ASSETS.image("resources/object_moon.png")
         moon_sprite.rect = moon_sprite.image.get_rect()
         moon_sprite.rect.centerx = screen.get_width() / 2
         moon_sprite.rect.centery = screen.get_height() / 2 + 30
@@ -122,9 +113,7 @@ class VictoryScene(Scene):
         radius = 145
         radians = math.radians(self.angle)
         icarus_sprite = pygame.sprite.Sprite()
-        icarus_sprite.image = pygame.image.load(
-            find_data_file("resources/icarus_body.png")
-        )
+        icarus_sprite.image = ASSETS.image("resources/icarus_body.png")
         rotated_image = pygame.transform.rotate(
             icarus_sprite.image, self.angle * -1 - 90
         )
@@ -137,8 +126,8 @@ class VictoryScene(Scene):
         )
         screen.blit(rotated_image, icarus_sprite.rect)
 
-        # Rotate Icarus
-        self.angle += 1
+        # Rotate Icarus once per simulation step, so the animation speed doesn't depend on the frame rate
+        self.angle += context["steps"]
         self.angle %= 360
 
         # Display the buttons
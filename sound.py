@@ -1,26 +1,128 @@
 import json
+import queue
+import threading
+import time
 
 import pygame
 
 from ecs import System
 from utils import find_data_file
 
+# Sound effects the first scenes need get decoded first. Anything not listed here comes after, in audio.json's order
+LOAD_ORDER = ["rollover", "click", "collect", "crash"]
+
+
+class ChannelPool:
+    """
+    Splits the mixer's channels up between categories of sound, so a flood of one kind of sound can't take every
+    channel, and never plays more sounds at once than there are channels.
+    When all of a category's channels are busy, the lowest priority sound (oldest first) is cut off for a new one,
+    as long as the new one is at least as important. Otherwise the new sound isn't played.
+    Each category has a gain, which every sound in it is played at.
+    """
+
+    def __init__(self, sizes):
+        pygame.mixer.set_num_channels(sum(sizes.values()))
+        # Keep pygame from picking any of our channels itself (e.g. for Sound.play)
+        pygame.mixer.set_reserved(sum(sizes.values()))
+
+        # Map of categories to their channels
+        self.channels = {}
+        first = 0
+        for (category, size) in sizes.items():
+            self.channels[category] = [
+                pygame.mixer.Channel(i) for i in range(first, first + size)
+            ]
+            first += size
+        self.gains = {category: 1.0 for category in sizes}
+
+        # Map of channels to the priority of what they're playing, and when it started (as a count of sounds played)
+        self.playing = {}
+        self.played = 0
+        self.stolen = 0
+
+    # Plays a sound on one of a category's channels, and returns the channel (or None if the sound wasn't played)
+    def play(self, category, sound, priority, loops=0):
+        channels = self.channels[category]
+        channel = next((c for c in channels if not c.get_busy()), None)
+        if channel is None:
+            if not channels:
+                return None
+            channel = min(channels, key=lambda c: self.playing[c])
+            if self.playing[channel][0] > priority:
+                return None
+            self.stolen += 1
+
+        channel.play(sound, loops=loops)
+        channel.set_volume(self.gains[category])
+        self.played += 1
+        self.playing[channel] = (priority, self.played)
+        return channel
+
+    # Changes the volume of a category, including sounds which are already playing
+    def set_gain(self, category, gain):
+        self.gains[category] = gain
+        for channel in self.channels[category]:
+            channel.set_volume(gain)
+
 
 class AudioSystem(System):
-    def __init__(self):
+    """
+    Plays the sounds named by "sound" events, as listed in resources/audio.json.
+    Sound effects are short, so they're all kept in memory and can overlap, within the limits of a ChannelPool. They're decoded on a worker thread,
+    so the game starts straight away. Until a sound is ready, playing it does nothing, and starting it waits.
+    Music is long, so it's streamed from disk through pygame.mixer.music, one track at a time.
+    Starting a track while another is playing fades the old one out, then fades the new one in.
+    """
+
+    reads = {"context"}
+    writes = set()
+
+    def __init__(self, fade_ms=1000):
         super().__init__()
         self.subscribe("sound")
 
         with open(find_data_file("resources/audio.json"), "r") as f:
             self.audio_table = json.load(f)
 
+        self.categories = self.audio_table["categories"]
+        self.pool = ChannelPool(
+            {name: category["channels"] for (name, category) in self.categories.items()}
+        )
+
+        # Sounds which have been decoded so far
         self.audio_files = {}
-        for (key, value) in self.audio_table.items():
-            self.audio_files[key] = pygame.mixer.Sound(find_data_file(value))
+        # Looping sounds which were started before they were ready
+        self.waiting_sounds = []
+        # How many seconds each sound took to decode, and how long after startup every sound was ready
+        self.load_timings = {}
+        self.ready_after = None
+        self.dropped = 0
+
+        self.started_at = time.perf_counter()
+        self.loaded = queue.Queue()
+        sfx = self.audio_table["sfx"]
+        order = [key for key in LOAD_ORDER if key in sfx]
+        order += [key for key in sfx if key not in order]
+        self.loader = threading.Thread(
+            target=self._load_sounds,
+            args=([(key, sfx[key]["file"]) for key in order],),
+            daemon=True,
+        )
+        self.loader.start()
+
+        # Music only gets opened when it's played
+        self.music_files = {}
+        for (key, value) in self.audio_table["music"].items():
+            self.music_files[key] = find_data_file(value)
+
+        # How long switching between tracks takes to fade out, and in again
+        self.fade_ms = fade_ms
+        # Track which is playing (or fading out), and the track to play as soon as it has faded out
+        self.current_music = None
+        self.queued_music = None
 
-        self.started_sounds = []
         self.previously_paused = False
-        self.reduced_volume = 0.7
 
     def process(self, events, world):
         world_events = self.pending()
@@ -28,32 +130,127 @@ class AudioSystem(System):
         context = world.find_component("context")
         currently_paused = context["paused"]
 
-        # If the game has been paused, quiet all background sounds
-        if not self.previously_paused and currently_paused:
-            for sound in self.started_sounds:
-                vol = sound.get_volume() - self.reduced_volume
-                sound.set_volume(vol)
-
-        # If the game has been unpaused, bring all sounds back to their
-        # regular volume
-        if self.previously_paused and not currently_paused:
-            for sound in self.started_sounds:
-                vol = sound.get_volume() + self.reduced_volume
-                sound.set_volume(vol)
+        # If the game has been paused, quiet background sounds down, and bring them back to their regular volume
+        # once it's unpaused
+        if self.previously_paused != currently_paused:
+            for (name, category) in self.categories.items():
+                gain = category["paused_gain"] if currently_paused else 1.0
+                self._set_gain(name, gain)
 
         # Store the current pause state
         self.previously_paused = currently_paused
 
+        self._collect_loaded_sounds()
+
         for event in world_events:
-            if event["action"] == "start":
-                sound = self.audio_files[event["sound"]]
+            if event.sound in self.music_files:
+                if event.action in ("start", "play"):
+                    self._start_music(event.sound)
+                if event.action == "stop":
+                    self._stop_music(event.sound)
+                continue
+
+            sound = self.audio_files.get(event.sound)
+            if sound is None:
+                self._not_ready(event)
+                continue
+
+            if event.action == "start":
                 if sound.get_num_channels() == 0:
-                    self.started_sounds.append(sound)
-                    sound.play(loops=-1)
-            if event["action"] == "stop":
-                sound = self.audio_files[event["sound"]]
+                    self._play(event.sound, loops=-1)
+            if event.action == "stop":
                 sound.stop()
-            if event["action"] == "play":
-                sound = self.audio_files[event["sound"]]
-                if sound.get_num_channels() == 0:
-                    sound.play()
+            if event.action == "play":
+                self._play(event.sound)
+
+        # Once the last track has faded out, move on to the next one
+        if self.queued_music is not None and not pygame.mixer.music.get_busy():
+            self._play_music(self.queued_music, self.fade_ms)
+            self.queued_music = None
+
+    # Runs on the loader thread, decoding each sound in turn and handing it over to the game loop
+    def _load_sounds(self, sounds):
+        for (key, path) in sounds:
+            start = time.perf_counter()
+            try:
+                sound = pygame.mixer.Sound(find_data_file(path))
+            except (pygame.error, FileNotFoundError):
+                sound = None
+            self.loaded.put((key, sound, time.perf_counter() - start))
+        self.loaded.put(None)
+
+    # Private helper to pick up any sounds the loader has finished since last time, and start any which were waiting
+    def _collect_loaded_sounds(self):
+        while True:
+            try:
+                item = self.loaded.get_nowait()
+            except queue.Empty:
+                return
+
+            if item is None:
+                self.ready_after = time.perf_counter() - self.started_at
+                continue
+
+            key, sound, seconds = item
+            self.load_timings[key] = seconds
+            if sound is None:
+                continue
+            self.audio_files[key] = sound
+            if key in self.waiting_sounds:
+                self.waiting_sounds.remove(key)
+                self._play(key, loops=-1)
+
+    # Private helper to play a decoded sound effect on its category's channels
+    def _play(self, key, loops=0):
+        sfx = self.audio_table["sfx"][key]
+        channel = self.pool.play(
+            sfx["category"], self.audio_files[key], sfx["priority"], loops
+        )
+        if channel is None:
+            self.dropped += 1
+
+    # Private helper to change a category's volume. Music is played outside of the channel pool, so it's set separately
+    def _set_gain(self, category, gain):
+        self.pool.set_gain(category, gain)
+        if category == "music":
+            pygame.mixer.music.set_volume(gain)
+
+    # Private helper for events about sounds which haven't been decoded yet. One off sounds would be late, so they're
+    # dropped, but looping sounds get started as soon as they're ready (unless they're stopped first)
+    def _not_ready(self, event):
+        key = event.sound
+        if event.action == "start":
+            if key not in self.waiting_sounds:
+                self.waiting_sounds.append(key)
+        if event.action == "stop":
+            if key in self.waiting_sounds:
+                self.waiting_sounds.remove(key)
+        if event.action == "play":
+            self.dropped += 1
+
+    # Loops a track. If a different track is playing, it gets faded out first
+    def _start_music(self, name):
+        if self.queued_music is not None:
+            # Already fading out, so whichever track was asked for last gets played afterwards
+            self.queued_music = name
+        elif self.current_music is None or not pygame.mixer.music.get_busy():
+            self._play_music(name, 0)
+        elif self.current_music != name:
+            self.queued_music = name
+            pygame.mixer.music.fadeout(self.fade_ms)
+
+    # Stops a track straight away, or makes sure it doesn't get played if it's waiting for another track to fade out.
+    # In that case the other track is still on its way out, so it doesn't count as playing any more either
+    def _stop_music(self, name):
+        if self.queued_music == name:
+            self.queued_music = None
+            self.current_music = None
+        if self.current_music == name:
+            pygame.mixer.music.stop()
+            self.current_music = None
+
+    def _play_music(self, name, fade_ms):
+        pygame.mixer.music.load(self.music_files[name])
+        pygame.mixer.music.set_volume(self.pool.gains["music"])
+        pygame.mixer.music.play(loops=-1, fade_ms=fade_ms)
+        self.current_music = name
@@ -0,0 +1,37 @@
+import os
+import sys
+
+# Run pygame without a window or sound card, and keep save files out of the real user data directory
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+# Let the tests import the game's modules from the repository root
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pygame  # noqa: E402
+import pytest  # noqa: E402
+
+from common_components import ContextComponent  # noqa: E402
+from ecs import WORLD, Component  # noqa: E402
+from scene import SceneManager  # noqa: E402
+
+
+# A world set up the way main() sets it up, with a screen but no global systems.
+# pygame is left running afterwards, since the asset cache holds on to fonts and surfaces between tests
+@pytest.fixture
+def game_world(tmp_path, monkeypatch):
+    monkeypatch.setenv("XDG_DATA_HOME", str(tmp_path))
+    pygame.init()
+    WORLD.reset()
+    SceneManager.scenes.clear()
+
+    settings = Component.load_from_json("settings")
+    WORLD.gen_entity().attach(settings)
+    screen = pygame.display.set_mode((settings["height"], settings["width"]))
+    background = pygame.Surface(screen.get_size()).convert()
+    WORLD.gen_entity().attach(ContextComponent(screen, pygame.time.Clock(), background))
+
+    yield WORLD
+
+    WORLD.reset()
+    SceneManager.scenes.clear()
@@ -0,0 +1,58 @@
+import pytest
+
+from ecs import WORLD, Event, System
+
+
+class PingEvent(Event):
+    __slots__ = ("value",)
+    type = "ping"
+
+    def __init__(self, value):
+        self.value = value
+
+
+class PingSystem(System):
+    def __init__(self):
+        super().__init__()
+        self.subscribe("ping")
+        self.received = []
+
+    def process(self, events, world):
+        self.received.append([event.value for event in self.pending()])
+
+
+@pytest.fixture(autouse=True)
+def world():
+    WORLD.reset()
+    yield WORLD
+    WORLD.reset()
+
+
+def test_events_reach_subscribers_on_the_next_process():
+    system = PingSystem()
+    WORLD.register_system(system)
+
+    WORLD.inject_event(PingEvent(1))
+    WORLD.inject_event(PingEvent(2))
+    WORLD.process_all_systems([])
+    WORLD.process_all_systems([])
+
+    assert system.received == [[1, 2], []]
+
+
+def test_event_fields_read_as_attributes_or_keys():
+    event = PingEvent(3)
+
+    assert event.value == 3
+    assert event["value"] == 3
+    assert event["type"] == "ping"
+
+
+def test_shared_events_are_made_once():
+    assert PingEvent.shared(4) is PingEvent.shared(4)
+    assert PingEvent.shared(4) is not PingEvent.shared(5)
+
+
+def test_dict_events_are_rejected():
+    with pytest.raises(TypeError):
+        WORLD.inject_event({"type": "ping", "value": 1})
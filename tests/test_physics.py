@@ -0,0 +1,128 @@
+import math
+
+import numpy as np
+import pygame
+import pytest
+
+from common_components import ContextComponent, PlayerComponent
+from ecs import WORLD
+from game_events import MOVE, PHYSICS_FRAME_RESET, PhysicsForceEvent
+from scenes.game import (
+    ForceSystem,
+    GraphicComponent,
+    MovementSystem,
+    PhysicsComponent,
+    PhysicsFrameResetSystem,
+    PositionComponent,
+    RotationComponent,
+)
+
+# Each body is (x, y, velocity, angle, rotation, sprite height, player, cloud sleeves)
+BODIES = [
+    (160, 486, 0, 0, -20, 81, True, False),
+    (400, 300, 12, -30, -45, 81, True, True),
+    (900, -2000, 25, -80, -60, 40, False, False),
+    (50, 700, -3, 10, 30, 120, False, False),
+]
+
+# The (magnitude, angle) of the forces applied on each step
+FORCES = [
+    [(-0.2, -20), (1.5, -20)],
+    [(0.4, -45)],
+    [],
+    [(0, 30), (2.0, -60), (-0.1, 10)],
+    [(0.3, -10)],
+]
+
+
+@pytest.fixture
+def world():
+    WORLD.reset()
+    WORLD.gen_entity().attach(ContextComponent(pygame.Surface((100, 100)), None, None))
+    for system in (PhysicsFrameResetSystem(), ForceSystem(), MovementSystem()):
+        WORLD.register_system(system)
+    yield WORLD
+    WORLD.reset()
+
+
+def spawn(world, body):
+    x, y, velocity, angle, rotation, height, player, cloud_sleeves = body
+    sprite = pygame.sprite.Sprite()
+    sprite.image = pygame.Surface((10, height))
+
+    entity = world.gen_entity()
+    entity.attach(GraphicComponent(sprite))
+    entity.attach(PositionComponent(x, y))
+    entity.attach(PhysicsComponent())
+    entity.attach(RotationComponent(rotation))
+    if player:
+        entity.attach(PlayerComponent())
+        entity.player.hasCloudSleeves = int(cloud_sleeves)
+    entity.physics.velocity = velocity
+    entity.physics.angle = angle
+    return entity
+
+
+# One entity at a time, the way the systems worked before they were vectorized
+def reference_step(body, forces):
+    x, y, velocity, angle, rotation, height, player, cloud_sleeves = body
+    acceleration = 0
+
+    for magnitude, force_angle in forces:
+        if magnitude == 0:
+            continue
+        if velocity == 0:
+            angle = force_angle
+        theta = math.radians(force_angle - angle)
+        acceleration = math.sqrt(
+            pow(magnitude, 2)
+            + pow(acceleration, 2)
+            + 2 * magnitude * acceleration * math.cos(theta)
+        ) * math.copysign(1, magnitude)
+        angle += math.degrees(theta / 2)
+        velocity += acceleration
+
+    in_space = y - 960 + height < -2200
+    cross_sectional_area = 0.1 + (0.75 - 0.1) * math.sin(math.radians(rotation - angle))
+    drag_coeff = 0.3 if cloud_sleeves else 0.9
+    air_density = 0.9 if in_space else 1.22
+    drag_magnitude = (
+        0.5 * drag_coeff * air_density * cross_sectional_area * pow(velocity, 2) / 62
+    ) * math.copysign(1, velocity)
+
+    radians = math.radians(angle)
+    drag_magnitude *= abs(math.sin(radians))
+    velocity -= drag_magnitude
+
+    x += math.cos(radians) * velocity
+    y += math.sin(radians) * velocity
+    if in_space:
+        y += 1
+    elif cloud_sleeves:
+        y += 4
+    else:
+        y += 8
+
+    return (x, y, velocity, angle, rotation, height, player, cloud_sleeves)
+
+
+def test_vectorized_physics_matches_the_scalar_reference(world):
+    entities = [spawn(world, body) for body in BODIES]
+    bodies = list(BODIES)
+
+    for forces in FORCES:
+        world.inject_event(PHYSICS_FRAME_RESET)
+        for magnitude, angle in forces:
+            world.inject_event(PhysicsForceEvent(magnitude, angle))
+        world.inject_event(MOVE)
+        world.process_all_systems([])
+
+        bodies = [reference_step(body, forces) for body in bodies]
+
+    positions = [(entity.position.x, entity.position.y) for entity in entities]
+    velocities = [
+        (entity.physics.velocity, entity.physics.angle) for entity in entities
+    ]
+
+    assert np.allclose(positions, [(body[0], body[1]) for body in bodies])
+    assert np.allclose(velocities, [(body[2], body[3]) for body in bodies])
@@ -0,0 +1,59 @@
+import pygame
+
+from game_events import BACK, CONTROLS
+from scene import SceneManager
+from scenes.title import TitleScene
+
+
+# Runs a frame the way main() does, with the given number of simulation steps (each seeing the same events)
+def run_frame(manager, world, events=(), steps=1):
+    context = world.find_component("context")
+    context["steps"] = steps
+    switch = manager.nothing()
+    for _ in range(steps):
+        switch = manager.update(list(events), world)
+    dirty_rects = manager.render(world)
+    manager.switch(switch, world)
+    return dirty_rects
+
+
+# Whether the display update for a frame's dirty rects would show everything inside rect
+def covered(dirty_rects, rect):
+    return dirty_rects is None or any(dirty.contains(rect) for dirty in dirty_rects)
+
+
+def keydown(key):
+    return pygame.event.Event(pygame.KEYDOWN, key=key)
+
+
+def test_title_prompt_is_shown_again_after_leaving_the_menu(game_world):
+    title = TitleScene()
+    manager = SceneManager(title, game_world)
+    run_frame(manager, game_world)
+    run_frame(manager, game_world, [keydown(pygame.K_a)])
+    run_frame(manager, game_world)
+    pygame.event.clear()
+
+    # Leaving the menu posts SCENE_REFOCUS, which the title only sees on its next step
+    run_frame(manager, game_world, [keydown(pygame.K_ESCAPE)])
+    run_frame(manager, game_world, steps=0)
+    assert title.push_anything not in title.title_screen
+
+    dirty_rects = run_frame(manager, game_world, pygame.event.get())
+    assert title.push_anything in title.title_screen
+    assert covered(dirty_rects, title.push_anything.rect)
+
+
+def test_menu_buttons_are_shown_again_after_leaving_controls(game_world):
+    manager = SceneManager(TitleScene(), game_world)
+    run_frame(manager, game_world, [keydown(pygame.K_a)])
+    run_frame(manager, game_world, [pygame.event.Event(CONTROLS)])
+    run_frame(manager, game_world)
+    pygame.event.clear()
+
+    run_frame(manager, game_world, [pygame.event.Event(BACK)])
+    run_frame(manager, game_world, steps=0)
+
+    dirty_rects = run_frame(manager, game_world, pygame.event.get())
+    for button in game_world.filter("button"):
+        assert covered(dirty_rects, button.button.rect)
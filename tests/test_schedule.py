@@ -0,0 +1,78 @@
+import pytest
+
+import headless
+from ecs import WORLD, System, schedule
+
+
+class DeclaredSystem(System):
+    def __init__(self, reads=(), writes=(), emits=(), structural=False):
+        super().__init__()
+        self.reads = set(reads)
+        self.writes = set(writes)
+        self.emits = tuple(emits)
+        self.structural = structural
+
+
+@pytest.fixture(autouse=True)
+def world():
+    WORLD.reset()
+    yield WORLD
+    WORLD.set_workers(0)
+    WORLD.reset()
+
+
+def test_systems_which_dont_conflict_share_a_stage():
+    first = DeclaredSystem(reads={"context"}, writes={"position"})
+    second = DeclaredSystem(reads={"context"}, writes={"camera"})
+
+    assert schedule([first, second]) == [[first, second]]
+
+
+def test_structural_and_undeclared_systems_run_alone():
+    before = DeclaredSystem(writes={"position"})
+    structural = DeclaredSystem(writes={"graphic"}, structural=True)
+    undeclared = System()
+    after = DeclaredSystem(writes={"camera"})
+
+    assert schedule([before, structural, undeclared, after]) == [
+        [before],
+        [structural],
+        [undeclared],
+        [after],
+    ]
+
+
+def test_conflicting_systems_keep_their_registration_order():
+    writer = DeclaredSystem(writes={"physics"})
+    reader = DeclaredSystem(reads={"physics"}, writes={"position"})
+    other_writer = DeclaredSystem(writes={"physics"})
+    emitter = DeclaredSystem(emits={"sound"})
+    other_emitter = DeclaredSystem(emits={"sound"})
+    unrelated = DeclaredSystem(reads={"context"}, writes={"camera"})
+
+    stages = schedule([writer, reader, other_writer, emitter, other_emitter, unrelated])
+
+    assert stages == [
+        [writer, emitter, unrelated],
+        [reader, other_emitter],
+        [other_writer],
+    ]
+
+
+def test_running_stages_in_parallel_gives_the_same_flights():
+    headless.init()
+    policies = [headless.AnglePolicy(angle=angle) for angle in (-35, -20, 10)]
+
+    serial = [
+        headless.run_flight(policy, seed=seed)
+        for policy in policies
+        for seed in range(3)
+    ]
+    WORLD.set_workers(2)
+    parallel = [
+        headless.run_flight(policy, seed=seed)
+        for policy in policies
+        for seed in range(3)
+    ]
+
+    assert parallel == serial